@@ -7,51 +7,92 @@ WebSocket 探测工具二进制打包脚本 (Python 3.6+ 兼容版本)
 import os
 import sys
 import subprocess
-import platform
 import shutil
+import stat
+import argparse
+import hashlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-def check_dependencies():
-    """检查必要的依赖"""
-    print("🔍 检查打包依赖...")
-    
-    # 检查 PyInstaller
+# Windows 下创建子进程时不分配控制台窗口（conhost），显著降低启动开销；
+# subprocess.CREATE_NO_WINDOW 在 Python 3.7 才加入，这里直接使用其数值
+CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0x08000000) if os.name == 'nt' else 0
+
+def run_command(*args, **kwargs):
+    """subprocess.run 的封装，Windows 下自动附加 CREATE_NO_WINDOW"""
+    kwargs.setdefault('creationflags', CREATE_NO_WINDOW)
+    return subprocess.run(*args, **kwargs)
+
+# 依赖模块名 -> 发行包名
+REQUIRED_PACKAGES = [
+    ('PyInstaller', 'pyinstaller'),
+    ('websockets', 'websockets'),
+    ('aiohttp', 'aiohttp'),
+]
+
+def get_package_version(dist_name):
+    """读取已安装包的版本号（不导入包本身）"""
     try:
-        import PyInstaller
-        print("✅ PyInstaller 已安装: {}".format(PyInstaller.__version__))
+        import importlib.metadata as metadata
     except ImportError:
-        try:
-            # 尝试通过命令行检查
-            result = subprocess.run([sys.executable, '-c', 'import PyInstaller; print(PyInstaller.__version__)'], 
-                                  stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            if result.returncode == 0:
-                version = result.stdout.decode('utf-8').strip()
-                print("✅ PyInstaller 已安装: {}".format(version))
-            else:
-                print("❌ PyInstaller 未安装")
-                print("安装命令: pip install pyinstaller")
-                return False
-        except:
-            print("❌ PyInstaller 未安装")
-            print("安装命令: pip install pyinstaller")
-            return False
+        # Python 3.6/3.7 没有 importlib.metadata
+        return '?'
+    try:
+        return metadata.version(dist_name)
+    except metadata.PackageNotFoundError:
+        return '?'
+
+def write_lines(lines):
+    """一次性写出多行输出，减少逐行 print 的 write 调用"""
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
+def check_dependencies():
+    """
+    检查必要的依赖
     
-    # 检查项目依赖
-    required_modules = ['websockets', 'aiohttp']
-    for module in required_modules:
-        try:
-            __import__(module)
-            print("✅ {} 已安装".format(module))
-        except ImportError:
-            print("❌ {} 未安装".format(module))
-            return False
+    使用 importlib.util.find_spec 定位模块而不执行模块代码，
+    避免导入 aiohttp 等重量级包或另起解释器检查。
+    """
+    lines = ["🔍 检查打包依赖..."]
     
-    return True
+    try:
+        for module, dist_name in REQUIRED_PACKAGES:
+            if importlib.util.find_spec(module) is None:
+                lines.append("❌ {} 未安装".format(module))
+                lines.append("安装命令: pip install {}".format(dist_name))
+                return False
+            lines.append("✅ {} 已安装: {}".format(module, get_package_version(dist_name)))
+        
+        return True
+    finally:
+        write_lines(lines)
+
+# Analysis 从 PyInstaller 6.6 起才支持 optimize 参数；更早的 6.x 会通过 **kwargs 静默忽略它
+PYINSTALLER_OPTIMIZE_MIN_VERSION = (6, 6)
 
+def get_pyinstaller_version():
+    """获取 PyInstaller 的 (主版本号, 次版本号)，无法确定时返回 (0, 0)"""
+    parts = get_package_version('pyinstaller').split('.')[:2]
+    try:
+        return tuple(int(part) for part in parts) + (0,) * (2 - len(parts))
+    except ValueError:
+        return (0, 0)
+
+@lru_cache(maxsize=1)
 def get_platform_info():
-    """获取平台信息"""
-    system = platform.system().lower()
-    machine = platform.machine().lower()
+    """获取平台信息（结果在进程内缓存）"""
+    if os.name == 'posix':
+        # POSIX 下直接使用 uname(2)，无需导入 platform 模块
+        uname = os.uname()
+        system = uname.sysname.lower()
+        machine = uname.machine.lower()
+    else:
+        import platform
+        system = platform.system().lower()
+        machine = platform.machine().lower()
     
     if system == "windows":
         platform_name = "windows"
@@ -68,9 +109,99 @@ def get_platform_info():
     
     return platform_name, machine, ext
 
-def create_spec_file():
-    """创建 PyInstaller 规格文件"""
+def get_binary_path(onedir=False):
+    """获取构建产物中可执行文件的路径"""
     platform_name, machine, ext = get_platform_info()
+    name = 'websocket-probe-{}-{}'.format(platform_name, machine)
+    if onedir:
+        return os.path.join('dist', name, name + ext)
+    return os.path.join('dist', name + ext)
+
+def create_spec_file(upx=False, onedir=False):
+    """
+    创建 PyInstaller 规格文件
+    
+    Args:
+        upx: 是否启用 UPX 压缩（默认关闭，避免打包时的压缩开销和启动时的解压开销）
+        onedir: 是否以目录模式打包（启动时无需解压到临时目录）
+    """
+    platform_name, machine, ext = get_platform_info()
+    name = 'websocket-probe-{}-{}'.format(platform_name, machine)
+    
+    # PyInstaller 6.6+ 支持在 Analysis 中指定字节码优化级别，
+    # optimize=2 会去掉 assert 和文档字符串，减小 PYZ 并加快启动时的反序列化。
+    # 注意：Python 3.6 最高只能运行 PyInstaller 4.10，在本脚本的目标解释器上
+    # 不会走到这个分支，只有用更新的 Python 运行本脚本时才生效
+    if get_pyinstaller_version() >= PYINSTALLER_OPTIMIZE_MIN_VERSION:
+        optimize_option = '    optimize=2,\n'
+    else:
+        optimize_option = ''
+        print("💡 当前 PyInstaller 不支持 optimize 参数，可使用 python -OO 运行本脚本以优化字节码")
+    
+    if onedir:
+        # 目录模式：EXE 只包含脚本，依赖由 COLLECT 收集到同名目录
+        package_content = '''
+# 打包为目录
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='{name}',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx={upx},
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=None,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx={upx},
+    upx_exclude=[],
+    name='{name}',
+)
+'''
+    else:
+        package_content = '''
+# 打包为单个文件
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    [],
+    name='{name}',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx={upx},
+    upx_exclude=[],
+    runtime_tmpdir=None,
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=None,
+)
+'''
     
     spec_content = '''# -*- mode: python ; coding: utf-8 -*-
 
@@ -114,133 +245,222 @@ a = Analysis(
         'PyQt6',
         'PySide2',
         'PySide6',
+        # 探测工具运行时用不到的标准库/第三方子包
+        'test',
+        'tests',
+        'unittest',
+        'distutils',
+        'lib2to3',
+        'pydoc',
+        'pydoc_data',
+        'xmlrpc',
+        'email.test',
+        'setuptools',
+        'pip',
+        'wheel',
+        'pkg_resources',
+        'sqlite3',
+        'curses',
+        'readline',
+        'asyncio.test',
+        'multiprocessing.tests',
     ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
     noarchive=False,
-)
+{optimize})
 
-# 打包为单个文件
-pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+# 去掉被间接收集但用不到的大体积动态库和 Tcl/Tk 数据
+a.binaries = [b for b in a.binaries
+              if not b[0].startswith(('libicudata', 'libicuuc', 'librsvg', 'libLLVM'))]
+a.datas = [d for d in a.datas
+           if not d[0].startswith(('tcl', 'tk', '_tcl_data', '_tk_data'))]
+{package}'''.format(optimize=optimize_option, package=package_content.format(name=name, upx=upx))
+    
+    # 内容未变化时不重写，保留 mtime 让 PyInstaller 的增量检查生效；
+    # 按字节比较以避免 Windows 换行转换导致的误判
+    spec_path = Path('websocket_probe.spec')
+    new_bytes = spec_content.encode('utf-8')
+    if not spec_path.exists() or spec_path.read_bytes() != new_bytes:
+        spec_path.write_bytes(new_bytes)
+        print("✅ 已创建规格文件: {}".format(spec_path))
+    else:
+        print("⏭️ 规格文件未变化: {}".format(spec_path))
+    return str(spec_path)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
-    [],
-    name='websocket-probe-{}-{}',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=True,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    icon=None,
-)
-'''.format(platform_name, machine)
+# 影响构建结果的输入文件
+BUILD_INPUTS = ['websocket_probe_py36.py', 'config_example.json', 'requirements.txt']
+BUILD_HASH_FILE = os.path.join('build', '.last_build_hash')
+
+def compute_build_hash(spec_file):
+    """计算构建输入（源文件 + 规格文件）的内容哈希"""
+    h = hashlib.blake2b(digest_size=16)
+    for path in BUILD_INPUTS + [spec_file]:
+        h.update(path.encode('utf-8'))
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+def remove_tree(path):
+    """
+    删除目录树，返回无法删除的路径列表（为空表示删除成功）
     
-    spec_file = 'websocket_probe.spec'
-    with open(spec_file, 'w', encoding='utf-8') as f:
-        f.write(spec_content)
+    遇到只读文件（常见于 Windows）时清除只读属性后重试，仍失败的路径记录下来由调用方报告。
+    """
+    failures = []
+    
+    def on_error(func, failed_path, error):
+        error = error[1] if isinstance(error, tuple) else error
+        if isinstance(error, FileNotFoundError):
+            return
+        try:
+            os.chmod(failed_path, stat.S_IWRITE)
+            func(failed_path)
+        except OSError:
+            failures.append(failed_path)
     
-    print("✅ 已创建规格文件: {}".format(spec_file))
-    return spec_file
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=on_error)
+    else:
+        shutil.rmtree(path, onerror=on_error)
+    return failures
 
-def build_binary():
-    """构建二进制文件"""
+def build_binary(upx=False, onedir=False, clean=False):
+    """
+    构建二进制文件
+    
+    默认保留 build/ 目录，让 PyInstaller 复用上次的模块分析和编译缓存；
+    仅在 clean=True 时才完整清理。
+    """
     print("🔨 开始构建二进制文件...")
     
     # 创建规格文件
-    spec_file = create_spec_file()
+    spec_file = create_spec_file(upx=upx, onedir=onedir)
     
-    # 清理之前的构建
-    for dir_name in ['build', 'dist', '__pycache__']:
-        if os.path.exists(dir_name):
-            shutil.rmtree(dir_name)
-            print("🗑️ 清理目录: {}".format(dir_name))
+    # 输入未变化且产物仍在时直接复用上次的构建
+    build_hash = compute_build_hash(spec_file)
+    stamp = Path(BUILD_HASH_FILE)
+    if not clean and stamp.exists() and stamp.read_text() == build_hash \
+            and os.path.exists(get_binary_path(onedir)):
+        print("⏭️ 源文件未变化，复用上次构建: {}".format(get_binary_path(onedir)))
+        return get_binary_path(onedir)
     
-    # 运行 PyInstaller
-    cmd = [
-        sys.executable, '-m', 'PyInstaller',
-        '--clean',
-        spec_file
-    ]
+    # 记录上次构建产物的大小，用于对比
+    previous_path = get_binary_path(onedir)
+    previous_size = os.path.getsize(previous_path) if os.path.exists(previous_path) else None
     
-    print("🚀 执行命令: {}".format(' '.join(cmd)))
+    if clean:
+        # 完整清理之前的构建（各目录互不相关，并行删除）
+        dir_names = [d for d in ['build', 'dist', '__pycache__'] if os.path.exists(d)]
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(remove_tree, dir_names))
+        cleanup_failed = False
+        for dir_name, failures in zip(dir_names, results):
+            if failures:
+                cleanup_failed = True
+                print("❌ 清理目录失败: {}（{} 个路径无法删除，例如 {}）".format(
+                    dir_name, len(failures), failures[0]))
+            else:
+                print("🗑️ 清理目录: {}".format(dir_name))
+        if cleanup_failed:
+            # 残留的旧文件会被当作新的构建结果，停止构建而不是继续使用过期内容
+            print("💡 请关闭占用这些文件的程序或检查权限后重试")
+            return None
+    else:
+        # 只删除旧的产物，避免测试步骤误用过期的二进制文件
+        stale_path = os.path.dirname(get_binary_path(onedir)) if onedir else get_binary_path()
+        if os.path.isdir(stale_path):
+            shutil.rmtree(stale_path)
+        elif os.path.exists(stale_path):
+            os.remove(stale_path)
+    
+    # 在当前解释器中运行 PyInstaller，省去再启动一个 Python 进程的开销
+    import PyInstaller.__main__
+    
+    pyinstaller_args = ['--noconfirm']
+    if clean:
+        pyinstaller_args.append('--clean')
+    pyinstaller_args.append(spec_file)
+    
+    print("🚀 执行 PyInstaller: {}".format(' '.join(pyinstaller_args)))
     
     try:
-        result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        print("✅ 构建成功！")
-        
-        # 显示构建结果
-        platform_name, machine, ext = get_platform_info()
-        binary_name = 'websocket-probe-{}-{}{}'.format(platform_name, machine, ext)
-        binary_path = os.path.join('dist', binary_name)
-        
-        if os.path.exists(binary_path):
-            size = os.path.getsize(binary_path)
-            size_mb = size / (1024 * 1024)
-            print("📦 二进制文件: {}".format(binary_path))
-            print("📏 文件大小: {:.1f} MB".format(size_mb))
-            
-            return binary_path
-        else:
-            print("❌ 未找到生成的二进制文件")
+        PyInstaller.__main__.run(pyinstaller_args)
+    except SystemExit as e:
+        if e.code:
+            print("❌ 构建失败: PyInstaller 退出码 {}".format(e.code))
             return None
-            
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print("❌ 构建失败: {}".format(e))
-        if hasattr(e, 'stderr') and e.stderr:
-            print("错误输出: {}".format(e.stderr.decode('utf-8')))
         return None
+    
+    print("✅ 构建成功！")
+    
+    # 显示构建结果
+    binary_path = get_binary_path(onedir)
+    
+    if os.path.exists(binary_path):
+        # 记录本次构建的输入哈希，供下次构建判断是否可以跳过
+        stamp.parent.mkdir(exist_ok=True)
+        stamp.write_text(build_hash)
+        
+        size = os.path.getsize(binary_path)
+        size_mb = size / (1024 * 1024)
+        print("📦 二进制文件: {}".format(binary_path))
+        print("📏 文件大小: {:.1f} MB".format(size_mb))
+        if previous_size is not None:
+            print("📐 上次构建: {:.1f} MB ({:+.1f} MB)".format(
+                previous_size / (1024 * 1024), (size - previous_size) / (1024 * 1024)))
+        
+        return binary_path
+    else:
+        print("❌ 未找到生成的二进制文件")
+        return None
+
+# --help 输出中应包含的标识（UTF-8 字节形式）
+HELP_NEEDLE = 'WebSocket 探测工具'.encode('utf-8')
 
 def test_binary(binary_path):
     """测试生成的二进制文件"""
-    print("🧪 测试二进制文件: {}".format(binary_path))
-    
     if not os.path.exists(binary_path):
-        print("❌ 二进制文件不存在")
+        write_lines(["🧪 测试二进制文件: {}".format(binary_path), "❌ 二进制文件不存在"])
         return False
     
-    # 测试帮助命令
+    # 测试帮助命令（运行前先输出提示，避免等待期间无输出）
     try:
-        print("⏳ 正在测试二进制文件...")
-        result = subprocess.run([binary_path, '--help'], 
-                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        stdout_text = result.stdout.decode('utf-8') if result.stdout else ""
-        stderr_text = result.stderr.decode('utf-8') if result.stderr else ""
+        write_lines(["🧪 测试二进制文件: {}".format(binary_path), "⏳ 正在测试二进制文件..."])
+        result = run_command([binary_path, '--help'],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=10)
         
-        if result.returncode == 0 and 'WebSocket 探测工具' in stdout_text:
+        # 直接在原始字节中查找，成功时无需解码整段输出
+        if result.returncode == 0 and HELP_NEEDLE in result.stdout:
             print("✅ 二进制文件测试通过")
             return True
         else:
-            print("❌ 二进制文件测试失败")
-            print("返回码: {}".format(result.returncode))
-            if stdout_text:
-                print("输出: {}...".format(stdout_text[:200]))
-            if stderr_text:
-                print("错误: {}...".format(stderr_text[:200]))
+            lines = ["❌ 二进制文件测试失败", "返回码: {}".format(result.returncode)]
+            if result.stdout:
+                lines.append("输出: {}...".format(result.stdout[:200].decode('utf-8', 'replace')))
+            if result.stderr:
+                lines.append("错误: {}...".format(result.stderr[:200].decode('utf-8', 'replace')))
+            write_lines(lines)
             return False
             
+    except subprocess.TimeoutExpired:
+        print("❌ 二进制文件测试超时")
+        return False
     except Exception as e:
         print("❌ 二进制文件测试异常: {}".format(e))
         return False
 
-def create_release_package():
+def create_release_package(onedir=False):
     """创建发布包"""
     platform_name, machine, ext = get_platform_info()
-    binary_name = 'websocket-probe-{}-{}{}'.format(platform_name, machine, ext)
-    binary_path = os.path.join('dist', binary_name)
+    binary_path = get_binary_path(onedir)
+    binary_name = os.path.basename(binary_path)
     
     if not os.path.exists(binary_path):
         print("❌ 二进制文件不存在，无法创建发布包")
@@ -252,12 +472,25 @@ def create_release_package():
         shutil.rmtree(release_dir)
     os.makedirs(release_dir)
     
-    # 复制文件
-    shutil.copy2(binary_path, release_dir)
-    if os.path.exists('README.md'):
-        shutil.copy2('README.md', release_dir)
-    if os.path.exists('config_example.json'):
-        shutil.copy2('config_example.json', release_dir)
+    # 复制文件（目录模式需要连同依赖目录一起复制），各文件并行复制。
+    # 发布包不需要保留元数据，使用 copyfile（Linux/macOS 上走 sendfile 零拷贝），
+    # 只为可执行文件单独设置权限
+    copy_jobs = []
+    if onedir:
+        binary_dir = os.path.dirname(binary_path)
+        copy_jobs.append((shutil.copytree, binary_dir, os.path.join(release_dir, os.path.basename(binary_dir))))
+        binary_name = os.path.join(os.path.basename(binary_dir), binary_name)
+    else:
+        copy_jobs.append((shutil.copyfile, binary_path, os.path.join(release_dir, binary_name)))
+    for extra_file in ['README.md', 'config_example.json']:
+        if os.path.exists(extra_file):
+            copy_jobs.append((shutil.copyfile, extra_file, os.path.join(release_dir, extra_file)))
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(func, src, dst) for func, src, dst in copy_jobs]
+        for future in futures:
+            future.result()
+    os.chmod(os.path.join(release_dir, binary_name), 0o755)
     
     # 创建使用说明
     usage_file = os.path.join(release_dir, 'USAGE.txt')
@@ -288,16 +521,24 @@ def create_release_package():
     
     # 显示文件列表
     print("📁 包含文件:")
-    for file in os.listdir(release_dir):
-        file_path = os.path.join(release_dir, file)
-        if os.path.isfile(file_path):
-            size = os.path.getsize(file_path)
-            print("  {} ({} bytes)".format(file, size))
+    with os.scandir(release_dir) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                print("  {} ({} bytes)".format(entry.name, entry.stat().st_size))
     
     return release_dir
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description='WebSocket 探测工具二进制打包程序')
+    parser.add_argument('--upx', action='store_true',
+                        help='启用 UPX 压缩 (减小体积，但打包和启动更慢)')
+    parser.add_argument('--onedir', action='store_true',
+                        help='以目录模式打包 (启动时无需解压到临时目录)')
+    parser.add_argument('--clean', action='store_true',
+                        help='清理 build/、dist/ 和 PyInstaller 缓存后完整重新构建')
+    args = parser.parse_args()
+    
     print("🔧 WebSocket 探测工具二进制打包程序")
     print("=" * 50)
     
@@ -316,7 +557,7 @@ def main():
     print("🖥️ 当前平台: {} ({})".format(platform_name, machine))
     
     # 构建二进制文件
-    binary_path = build_binary()
+    binary_path = build_binary(upx=args.upx, onedir=args.onedir, clean=args.clean)
     if not binary_path:
         print("❌ 构建失败")
         return 1
@@ -327,14 +568,14 @@ def main():
         return 1
     
     # 创建发布包
-    release_dir = create_release_package()
+    release_dir = create_release_package(onedir=args.onedir)
     if not release_dir:
         print("❌ 创建发布包失败")
         return 1
     
     print("\n🎉 打包完成！")
     print("📦 发布包位置: {}/".format(release_dir))
-    print("🚀 可执行文件: {}".format(os.path.join(release_dir, os.path.basename(binary_path))))
+    print("🚀 可执行文件: {}".format(os.path.join(release_dir, os.path.relpath(binary_path, 'dist'))))
     
     return 0
 
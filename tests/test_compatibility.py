@@ -5,8 +5,18 @@ WebSocket 兼容性测试脚本
 """
 
 import sys
-import websockets
-import traceback
+import importlib
+
+def lazy_import(module_name):
+    """按需导入模块，已加载时直接复用 sys.modules 中的模块"""
+    return sys.modules.get(module_name) or importlib.import_module(module_name)
+
+# 兼容性分组：新版异常类名与旧版异常类名
+COMPATIBILITY_GROUPS = [
+    ('InvalidStatus', {'InvalidStatus', 'InvalidStatusCode'}),
+    ('InvalidHandshake', {'InvalidHandshake', 'InvalidHandshakeError'}),
+    ('ConnectionClosed', {'ConnectionClosed', 'ConnectionClosedError'}),
+]
 
 def test_websocket_exceptions():
     """测试 websockets 库的异常类兼容性"""
@@ -23,45 +33,51 @@ def test_websocket_exceptions():
         'ConnectionClosedError'
     ]
     
+    # 新版 websockets 不会在 import websockets 时自动加载 exceptions 子模块，需显式导入
+    exceptions_module = lazy_import('websockets.exceptions')
     results = {}
+    lines = []
+    
+    # 一次性取模块命名空间，避免逐个 getattr 失败时构造 AttributeError；
+    # 新版 websockets 通过模块级 __getattr__ 懒加载已弃用的别名，未命中时再回退到 getattr
+    exceptions_ns = vars(exceptions_module)
     
     for exception_name in exceptions_to_test:
-        try:
-            exception_class = getattr(websockets.exceptions, exception_name)
+        exception_class = exceptions_ns.get(exception_name)
+        if exception_class is None:
+            exception_class = getattr(exceptions_module, exception_name, None)
+        
+        if exception_class is not None:
             results[exception_name] = {
                 'exists': True,
                 'class': exception_class,
                 'error': None
             }
-            print(f"✅ {exception_name}: 存在")
-        except AttributeError as e:
+            lines.append(f"✅ {exception_name}: 存在")
+        else:
+            error = f"module 'websockets.exceptions' has no attribute {exception_name!r}"
             results[exception_name] = {
                 'exists': False,
                 'class': None,
-                'error': str(e)
+                'error': error
             }
-            print(f"❌ {exception_name}: 不存在 ({str(e)})")
-    
-    print("\n📊 兼容性分析:")
-    print("-" * 30)
+            lines.append(f"❌ {exception_name}: 不存在 ({error})")
     
-    # 分析结果
-    if results['InvalidStatus']['exists'] or results['InvalidStatusCode']['exists']:
-        print("✅ InvalidStatus 兼容性: 支持")
-    else:
-        print("❌ InvalidStatus 兼容性: 不支持")
+    lines.append("\n📊 兼容性分析:")
+    lines.append("-" * 30)
     
-    if results['InvalidHandshake']['exists'] or results['InvalidHandshakeError']['exists']:
-        print("✅ InvalidHandshake 兼容性: 支持")
-    else:
-        print("❌ InvalidHandshake 兼容性: 不支持")
+    # 分析结果：每组中任意一个异常类存在即视为兼容
+    present = {name for name, result in results.items() if result['exists']}
+    for label, group in COMPATIBILITY_GROUPS:
+        if present & group:
+            lines.append(f"✅ {label} 兼容性: 支持")
+        else:
+            lines.append(f"❌ {label} 兼容性: 不支持")
     
-    if results['ConnectionClosed']['exists'] or results['ConnectionClosedError']['exists']:
-        print("✅ ConnectionClosed 兼容性: 支持")
-    else:
-        print("❌ ConnectionClosed 兼容性: 不支持")
+    # 汇总后一次性输出，避免多次 print 与测试框架捕获的 stderr 交错
+    sys.stdout.write('\n'.join(lines) + '\n')
     
-    return results
+    return results, present
 
 def test_compatibility_module():
     """测试兼容性模块"""
@@ -96,6 +112,8 @@ def test_compatibility_module():
         return False
     except Exception as e:
         print(f"❌ 兼容性模块测试失败: {e}")
+        # 仅在出错时才导入 traceback，正常路径不承担其导入开销
+        import traceback
         traceback.print_exc()
         return False
 
@@ -104,6 +122,7 @@ def test_websockets_version():
     print("\n📦 WebSockets 库信息")
     print("=" * 50)
     
+    websockets = lazy_import('websockets')
     try:
         version = websockets.__version__
         print(f"📋 版本: {version}")
@@ -131,7 +150,7 @@ def main():
     test_websockets_version()
     
     # 测试异常类兼容性
-    exception_results = test_websocket_exceptions()
+    exception_results, present = test_websocket_exceptions()
     
     # 测试兼容性模块
     compatibility_ok = test_compatibility_module()
@@ -149,20 +168,11 @@ def main():
     
     # 建议
     print("\n💡 建议:")
-    if exception_results['InvalidStatus']['exists'] or exception_results['InvalidStatusCode']['exists']:
-        print("  - InvalidStatus 异常处理: 正常")
-    else:
-        print("  - InvalidStatus 异常处理: 需要兼容性修复")
-    
-    if exception_results['InvalidHandshake']['exists'] or exception_results['InvalidHandshakeError']['exists']:
-        print("  - InvalidHandshake 异常处理: 正常")
-    else:
-        print("  - InvalidHandshake 异常处理: 需要兼容性修复")
-    
-    if exception_results['ConnectionClosed']['exists'] or exception_results['ConnectionClosedError']['exists']:
-        print("  - ConnectionClosed 异常处理: 正常")
-    else:
-        print("  - ConnectionClosed 异常处理: 需要兼容性修复")
+    for label, group in COMPATIBILITY_GROUPS:
+        if present & group:
+            print(f"  - {label} 异常处理: 正常")
+        else:
+            print(f"  - {label} 异常处理: 需要兼容性修复")
     
     print("\n🎯 如果所有测试都通过，说明兼容性修复成功！")
 
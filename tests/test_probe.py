@@ -4,62 +4,87 @@ WebSocket 探测工具测试脚本
 用于快速测试 websocket_probe.py 的功能
 """
 
+import argparse
 import subprocess
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 测试并行执行，每个测试的输出先在本地收集，再持锁一次性打印，避免交错
+print_lock = threading.Lock()
 
 def run_test(description, command):
     """运行测试命令"""
-    print(f"\n🧪 测试: {description}")
-    print(f"命令: {' '.join(command)}")
-    print("-" * 50)
+    lines = [
+        f"\n🧪 测试: {description}",
+        f"命令: {' '.join(command)}",
+        "-" * 50,
+    ]
     
     try:
         result = subprocess.run(command, capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
-            print("✅ 测试成功")
+            lines.append("✅ 测试成功")
         else:
-            print("❌ 测试失败")
-            print(f"错误输出: {result.stderr}")
-        return result.returncode == 0
+            lines.append("❌ 测试失败")
+            lines.append(f"错误输出: {result.stderr}")
+        success = result.returncode == 0
     except subprocess.TimeoutExpired:
-        print("⏰ 测试超时")
-        return False
+        lines.append("⏰ 测试超时")
+        success = False
     except Exception as e:
-        print(f"❌ 测试异常: {e}")
-        return False
+        lines.append(f"❌ 测试异常: {e}")
+        success = False
+    
+    with print_lock:
+        print('\n'.join(lines))
+    return success
+
+# 测试表：network 为 True 的测试需要访问外部 Echo 服务器，默认跳过
+TESTS = [
+    {
+        "description": "帮助信息显示",
+        "command": [sys.executable, "websocket_probe.py", "--help"],
+        "network": False
+    },
+    {
+        "description": "基础探测 - Echo 服务器",
+        "command": [sys.executable, "websocket_probe.py", "wss://echo.websocket.org", "--mode", "basic"],
+        "network": True
+    },
+    {
+        "description": "自定义消息测试",
+        "command": [sys.executable, "websocket_probe.py", "wss://echo.websocket.org", "--message", "Hello Test!"],
+        "network": True
+    },
+    {
+        "description": "JSON 消息测试",
+        "command": [sys.executable, "websocket_probe.py", "wss://echo.websocket.org", 
+                   "--message", '{"type": "test", "data": "probe"}'],
+        "network": True
+    }
+]
 
 def main():
+    parser = argparse.ArgumentParser(description='WebSocket 探测工具测试套件')
+    parser.add_argument('--network', action='store_true',
+                        help='同时运行需要访问外部 Echo 服务器的网络测试 (默认跳过)')
+    args = parser.parse_args()
+    
     print("🚀 WebSocket 探测工具测试套件")
     print("=" * 50)
     
-    tests = [
-        {
-            "description": "帮助信息显示",
-            "command": [sys.executable, "websocket_probe.py", "--help"]
-        },
-        {
-            "description": "基础探测 - Echo 服务器",
-            "command": [sys.executable, "websocket_probe.py", "wss://echo.websocket.org", "--mode", "basic"]
-        },
-        {
-            "description": "自定义消息测试",
-            "command": [sys.executable, "websocket_probe.py", "wss://echo.websocket.org", "--message", "Hello Test!"]
-        },
-        {
-            "description": "JSON 消息测试",
-            "command": [sys.executable, "websocket_probe.py", "wss://echo.websocket.org", 
-                       "--message", '{"type": "test", "data": "probe"}']
-        }
-    ]
+    tests = [test for test in TESTS if args.network or not test["network"]]
+    skipped = len(TESTS) - len(tests)
+    if skipped:
+        print(f"⏭️ 跳过 {skipped} 个网络测试（使用 --network 运行）")
     
-    passed = 0
     total = len(tests)
     
-    for test in tests:
-        if run_test(test["description"], test["command"]):
-            passed += 1
-        time.sleep(1)  # 避免过于频繁的请求
+    # 各测试互不依赖，并行执行；并发数仅为测试数量，不会对服务器造成压力
+    with ThreadPoolExecutor(max_workers=total) as executor:
+        results = list(executor.map(lambda test: run_test(test["description"], test["command"]), tests))
+    passed = sum(results)
     
     print("\n" + "=" * 50)
     print(f"📊 测试结果: {passed}/{total} 通过")
@@ -11,12 +11,43 @@ import time
 import argparse
 import logging
 import ssl
+import re
+import inspect
+from functools import lru_cache
+from operator import attrgetter
 from typing import Optional, Dict, Any, List
 from urllib.parse import urlparse
+import os
 import signal
 import sys
 import aiohttp
 
+# 可选的 orjson 加速 JSON 解析/序列化，未安装时使用标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    """解析 JSON（orjson 可用时使用 orjson）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj) -> str:
+    """序列化为 JSON 字符串（orjson 可用时使用 orjson）"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+# 设置日志：只在模块导入时配置一次，而不是每创建一个探测实例都调用 basicConfig
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
 # 兼容性异常处理
 class WebSocketExceptions:
     """兼容不同版本 websockets 库的异常类"""
@@ -59,9 +90,178 @@ InvalidStatusException = WebSocketExceptions.get_invalid_status_exception()
 InvalidHandshakeException = WebSocketExceptions.get_invalid_handshake_exception()
 ConnectionClosedException = WebSocketExceptions.get_connection_closed_exception()
 
+# 响应时间以 perf_counter_ns 的整数纳秒累计，只在显示时换算为毫秒
+NS_PER_MS = 1_000_000
+
+def get_connect_headers_kwarg() -> Optional[str]:
+    """
+    检测 websockets.connect 传递自定义头部所用的参数名
+    
+    websockets 14+ 使用 additional_headers，旧版本使用 extra_headers。
+    
+    Returns:
+        str: 参数名，都不支持时返回 None
+    """
+    try:
+        parameters = inspect.signature(websockets.connect).parameters
+    except (TypeError, ValueError):
+        return None
+    for name in ('additional_headers', 'extra_headers'):
+        if name in parameters:
+            return name
+    return None
+
+# 在导入时检测一次，避免每次连接都通过 TypeError 试探参数名
+CONNECT_HEADERS_KWARG = get_connect_headers_kwarg()
+
+def get_recv_decode_supported() -> bool:
+    """
+    检测连接的 recv 是否支持 decode 参数
+    
+    websockets 14+ 的 websockets.connect 使用 asyncio 实现，支持 recv(decode=False)，
+    文本帧直接以原始字节返回，跳过 UTF-8 解码与校验；13.x 虽已提供 asyncio 实现，
+    但 websockets.connect 仍是旧版客户端，其 recv 不支持该参数。
+    """
+    try:
+        from websockets.asyncio.client import ClientConnection, connect
+    except ImportError:
+        return False
+    if websockets.connect is not connect:
+        return False
+    try:
+        return 'decode' in inspect.signature(ClientConnection.recv).parameters
+    except (TypeError, ValueError):
+        return False
+
+RECV_DECODE_SUPPORTED = get_recv_decode_supported()
+
+@lru_cache(maxsize=2)
+def _make_ssl_context(skip_verify: bool) -> ssl.SSLContext:
+    """创建（并缓存）SSL 上下文，避免每次连接都重新加载系统证书"""
+    ssl_context = ssl.create_default_context()
+    if skip_verify:
+        # 跳过证书验证（仅用于测试环境）
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+# 日志中消息预览的最大字符数（bytes 消息为字节数）
+MESSAGE_PREVIEW_CHARS = 100
+
+# 生成日志预览时只对不超过该长度的消息做 JSON 格式化，更大的消息直接截取原文
+PREVIEW_PARSE_MAX_CHARS = 4096
+
+# 连续/压力测试模式下默认接受的单条消息最大字节数，超出时连接以 1009 关闭
+DEFAULT_PROBE_MAX_SIZE = 2 ** 16
+
+# 交互模式从管道读取输入时单行的最大字节数
+STDIN_LINE_LIMIT = 2 ** 20
+
+# 连接被拒绝时按 HTTP 状态码给出的提示（每项为依次输出的多行提示）
+STATUS_CODE_HINTS = {
+    200: ("💡 提示: 状态码200表示这是普通HTTP服务，不是WebSocket服务",
+          "   请检查：1) URL路径是否正确 2) 服务器是否支持WebSocket协议"),
+    404: ("💡 提示: 路径不存在，请检查WebSocket端点路径",),
+    403: ("💡 提示: 访问被拒绝，可能需要认证或权限",),
+    401: ("💡 提示: 需要认证，请检查认证头部",),
+}
+
+# 判断握手失败是否与协议升级有关
+_UPGRADE_ERROR_SEARCH = re.compile(r'upgrade|websocket', re.IGNORECASE).search
+
+class ProbeStats:
+    """探测统计信息（使用 __slots__ 固定字段，响应时间相关字段的单位为纳秒）"""
+    
+    __slots__ = (
+        'connection_attempts',
+        'successful_connections',
+        'failed_connections',
+        'messages_sent',
+        'messages_received',
+        'total_response_time',
+        'min_response_time',
+        'max_response_time',
+    )
+    
+    # 汇总时直接求和的字段
+    SUM_FIELDS = __slots__[:6]
+    
+    def __init__(self):
+        self.connection_attempts = 0
+        self.successful_connections = 0
+        self.failed_connections = 0
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.total_response_time = 0
+        self.min_response_time = float('inf')
+        self.max_response_time = 0
+    
+    def record_response(self, response_ns: int):
+        """记录一次收到的响应"""
+        self.messages_received += 1
+        self.total_response_time += response_ns
+        if response_ns < self.min_response_time:
+            self.min_response_time = response_ns
+        if response_ns > self.max_response_time:
+            self.max_response_time = response_ns
+    
+    @property
+    def avg_response_time(self) -> float:
+        """平均响应时间（毫秒），未收到响应时为 0"""
+        if not self.messages_received:
+            return 0.0
+        return self.total_response_time / self.messages_received / NS_PER_MS
+    
+    @property
+    def success_rate(self) -> float:
+        """连接成功率（百分比），未尝试连接时为 0"""
+        if not self.connection_attempts:
+            return 0.0
+        return self.successful_connections / self.connection_attempts * 100
+    
+    @classmethod
+    def aggregate(cls, stats_list: List['ProbeStats']) -> 'ProbeStats':
+        """
+        汇总多个探测器的统计信息
+        
+        先用一次 attrgetter 取出每个对象的全部字段，再 zip 转置成按字段排列的列，
+        每列交给内置的 sum/min/max 一次性归约。
+        """
+        total = cls()
+        if not stats_list:
+            return total
+        columns = list(zip(*map(_STATS_GETTER, stats_list)))
+        for field, column in zip(cls.SUM_FIELDS, columns):
+            setattr(total, field, sum(column))
+        min_column, max_column = columns[len(cls.SUM_FIELDS):]
+        total.min_response_time = min(min_column)
+        total.max_response_time = max(max_column)
+        return total
+
+_STATS_GETTER = attrgetter(*ProbeStats.__slots__)
+
 class WebSocketProbe:
+    # 固定实例属性，压力测试中大量创建探测器时减少每个对象的内存占用
+    __slots__ = (
+        'uri',
+        'timeout',
+        'headers',
+        'skip_ssl_verify',
+        'debug',
+        'parse_json',
+        'preview_key',
+        '_preview_token',
+        'validate_utf8',
+        'max_size',
+        'connection',
+        'stats',
+        'logger',
+    )
+    
     def __init__(self, uri: str, timeout: int = 5, headers: Optional[Dict[str, str]] = None, 
-                 skip_ssl_verify: bool = False, debug: bool = False):
+                 skip_ssl_verify: bool = False, debug: bool = False, parse_json: bool = False,
+                 validate_utf8: bool = True, max_size: Optional[int] = None,
+                 preview_key: Optional[str] = None):
         """
         初始化 WebSocket 探测器
         
@@ -71,30 +271,27 @@ class WebSocketProbe:
             headers: 额外的HTTP头部
             skip_ssl_verify: 是否跳过SSL证书验证（仅用于测试环境）
             debug: 是否启用调试模式
+            parse_json: 是否将收到的 JSON 消息解析后再显示
+            validate_utf8: 是否对响应的文本帧做 UTF-8 解码校验；关闭后
+                send_message/send_messages 收到的文本帧以原始字节返回
+                （需要 websockets 14+，旧版本忽略此设置）
+            max_size: 接收单条消息的最大字节数，为 None 时使用 websockets 的默认值
+            preview_key: 只显示 JSON 消息中该顶层字段的值，不含该字段的消息原样显示
         """
         self.uri = uri
         self.timeout = timeout
         self.headers = headers or {}
         self.skip_ssl_verify = skip_ssl_verify
         self.debug = debug
+        self.parse_json = parse_json
+        self.preview_key = preview_key
+        # 预先生成 JSON 中字段名的字面形式，用于解析前快速排除不含该字段的消息
+        self._preview_token = json_dumps(preview_key) if preview_key is not None else None
+        self.validate_utf8 = validate_utf8
+        self.max_size = max_size
         self.connection = None
-        self.stats = {
-            'connection_attempts': 0,
-            'successful_connections': 0,
-            'failed_connections': 0,
-            'messages_sent': 0,
-            'messages_received': 0,
-            'total_response_time': 0,
-            'min_response_time': float('inf'),
-            'max_response_time': 0
-        }
-        
-        # 设置日志
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        self.stats = ProbeStats()
+        
         self.logger = logging.getLogger(__name__)
 
     async def connect(self) -> bool:
@@ -105,111 +302,75 @@ class WebSocketProbe:
             bool: 连接是否成功
         """
         try:
-            self.stats['connection_attempts'] += 1
-            self.logger.info(f"正在连接到 {self.uri}...")
+            self.stats.connection_attempts += 1
+            self.logger.info("正在连接到 %s...", self.uri)
             
-            if self.debug:
-                self.logger.info(f"🔍 调试模式: 超时={self.timeout}秒, 头部={self.headers}")
+            if self.debug and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("🔍 调试模式: 超时=%s秒, 头部=%s", self.timeout, self.headers)
             
             # 处理 SSL 设置
             ssl_context = None
             if self.uri.startswith('wss://'):
-                ssl_context = ssl.create_default_context()
+                ssl_context = _make_ssl_context(self.skip_ssl_verify)
                 if self.skip_ssl_verify:
-                    # 跳过证书验证（仅用于测试环境）
-                    ssl_context.check_hostname = False
-                    ssl_context.verify_mode = ssl.CERT_NONE
                     self.logger.warning("⚠️ 已禁用SSL证书验证（仅用于测试环境）")
                     
-                if self.debug:
-                    self.logger.info(f"🔍 SSL设置: verify={not self.skip_ssl_verify}")
+                if self.debug and self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("🔍 SSL设置: verify=%s", not self.skip_ssl_verify)
             
-            # 处理 websockets 库版本兼容性
-            try:
-                # 尝试使用新版本的参数名
-                self.connection = await asyncio.wait_for(
-                    websockets.connect(
-                        self.uri,
-                        additional_headers=self.headers,
-                        ssl=ssl_context,
-                        ping_interval=20,
-                        ping_timeout=10
-                    ),
-                    timeout=self.timeout
-                )
-            except TypeError as e:
-                if 'additional_headers' in str(e):
-                    # 如果 additional_headers 不支持，尝试 extra_headers
-                    try:
-                        self.connection = await asyncio.wait_for(
-                            websockets.connect(
-                                self.uri,
-                                extra_headers=self.headers,
-                                ssl=ssl_context,
-                                ping_interval=20,
-                                ping_timeout=10
-                            ),
-                            timeout=self.timeout
-                        )
-                    except TypeError as e2:
-                        if 'extra_headers' in str(e2):
-                            # 如果都不支持，则不传递头部
-                            self.logger.warning("⚠️ 当前 websockets 版本不支持自定义头部，将忽略头部设置")
-                            self.connection = await asyncio.wait_for(
-                                websockets.connect(
-                                    self.uri,
-                                    ssl=ssl_context,
-                                    ping_interval=20,
-                                    ping_timeout=10
-                                ),
-                                timeout=self.timeout
-                            )
-                        else:
-                            raise e2
+            # 处理 websockets 库版本兼容性：头部参数名已在导入时检测
+            connect_kwargs = {
+                'ssl': ssl_context,
+                'ping_interval': 20,
+                'ping_timeout': 10
+            }
+            if self.max_size is not None:
+                connect_kwargs['max_size'] = self.max_size
+            if self.headers:
+                if CONNECT_HEADERS_KWARG:
+                    connect_kwargs[CONNECT_HEADERS_KWARG] = self.headers
                 else:
-                    raise e
+                    self.logger.warning("⚠️ 当前 websockets 版本不支持自定义头部，将忽略头部设置")
             
-            self.stats['successful_connections'] += 1
+            self.connection = await asyncio.wait_for(
+                websockets.connect(self.uri, **connect_kwargs),
+                timeout=self.timeout
+            )
+            
+            self.stats.successful_connections += 1
             self.logger.info("✅ WebSocket 连接成功建立")
             return True
             
         except asyncio.TimeoutError:
-            self.stats['failed_connections'] += 1
-            self.logger.error(f"❌ 连接超时 ({self.timeout}秒)")
+            self.stats.failed_connections += 1
+            self.logger.error("❌ 连接超时 (%s秒)", self.timeout)
             return False
         except InvalidStatusException as e:
-            self.stats['failed_connections'] += 1
+            self.stats.failed_connections += 1
             # 兼容不同版本的 websockets 库
             status_code = getattr(e, 'status_code', None) or getattr(e, 'response', None)
             if hasattr(status_code, 'status_code'):
                 status_code = status_code.status_code
             status_code = status_code or 'Unknown'
-            self.logger.error(f"❌ 连接失败，状态码: {status_code}")
+            self.logger.error("❌ 连接失败，状态码: %s", status_code)
             
             # 提供更详细的错误信息
-            if status_code == 200:
-                self.logger.error("💡 提示: 状态码200表示这是普通HTTP服务，不是WebSocket服务")
-                self.logger.error("   请检查：1) URL路径是否正确 2) 服务器是否支持WebSocket协议")
-            elif status_code == 404:
-                self.logger.error("💡 提示: 路径不存在，请检查WebSocket端点路径")
-            elif status_code == 403:
-                self.logger.error("💡 提示: 访问被拒绝，可能需要认证或权限")
-            elif status_code == 401:
-                self.logger.error("💡 提示: 需要认证，请检查认证头部")
+            for hint in STATUS_CODE_HINTS.get(status_code, ()):
+                self.logger.error(hint)
                 
             return False
         except InvalidHandshakeException as e:
-            self.stats['failed_connections'] += 1
-            self.logger.error(f"❌ 握手失败: {str(e)}")
+            self.stats.failed_connections += 1
+            self.logger.error("❌ 握手失败: %s", e)
             
             # 检查是否是协议升级问题
-            if "upgrade" in str(e).lower() or "websocket" in str(e).lower():
+            if _UPGRADE_ERROR_SEARCH(str(e)):
                 self.logger.error("💡 提示: WebSocket协议升级失败，服务器可能不支持WebSocket")
                 
             return False
         except Exception as e:
-            self.stats['failed_connections'] += 1
-            self.logger.error(f"❌ 连接失败: {str(e)}")
+            self.stats.failed_connections += 1
+            self.logger.error("❌ 连接失败: %s", e)
             return False
 
     async def send_message(self, message: str) -> Optional[float]:
@@ -227,39 +388,123 @@ class WebSocketProbe:
             return None
             
         try:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             
             await self.connection.send(message)
-            self.stats['messages_sent'] += 1
-            self.logger.info(f"📤 发送消息: {message[:100]}...")
+            self.stats.messages_sent += 1
+            self.logger.info("📤 发送消息: %.100s...", message)
             
             # 等待响应
             response = await asyncio.wait_for(
-                self.connection.recv(),
+                self._recv_response(),
                 timeout=self.timeout
             )
             
-            end_time = time.time()
-            response_time = (end_time - start_time) * 1000  # 转换为毫秒
+            response_ns = time.perf_counter_ns() - start_ns
+            response_time = response_ns / NS_PER_MS  # 转换为毫秒
             
-            self.stats['messages_received'] += 1
-            self.stats['total_response_time'] += response_time
-            self.stats['min_response_time'] = min(self.stats['min_response_time'], response_time)
-            self.stats['max_response_time'] = max(self.stats['max_response_time'], response_time)
+            self.stats.record_response(response_ns)
             
-            self.logger.info(f"📥 收到响应 ({response_time:.2f}ms): {response[:100]}...")
+            # 仅在会输出时才生成响应预览
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("📥 收到响应 (%.2fms): %s...", response_time, self._preview(response))
             return response_time
             
         except asyncio.TimeoutError:
-            self.logger.error(f"❌ 消息响应超时 ({self.timeout}秒)")
+            self.logger.error("❌ 消息响应超时 (%s秒)", self.timeout)
             return None
         except ConnectionClosedException:
             self.logger.error("❌ 连接已关闭")
             return None
         except Exception as e:
-            self.logger.error(f"❌ 发送消息失败: {str(e)}")
+            self.logger.error("❌ 发送消息失败: %s", e)
             return None
 
+    def _recv_response(self):
+        """接收一条响应；关闭 UTF-8 校验时文本帧不解码，直接返回原始字节"""
+        if not self.validate_utf8 and RECV_DECODE_SUPPORTED:
+            return self.connection.recv(decode=False)
+        return self.connection.recv()
+
+    async def send_messages(self, messages: List[str]) -> int:
+        """
+        批量发送消息并接收对应的响应
+        
+        所有消息先通过 asyncio.gather 一次性写出，再依次接收响应；
+        websockets 不允许在同一连接上并发调用 recv。
+        
+        Args:
+            messages: 要发送的消息列表
+            
+        Returns:
+            int: 收到的响应数量
+        """
+        if not self.connection:
+            self.logger.error("❌ 没有活跃的连接")
+            return 0
+        
+        received = 0
+        try:
+            self.logger.info("📤 批量发送 %d 条消息", len(messages))
+            start_ns = time.perf_counter_ns()
+            
+            await asyncio.gather(*(self.connection.send(message) for message in messages))
+            self.stats.messages_sent += len(messages)
+            
+            # 等待全部响应，响应时间从整批发送开始计算
+            for _ in messages:
+                await asyncio.wait_for(self._recv_response(), timeout=self.timeout)
+                response_ns = time.perf_counter_ns() - start_ns
+                received += 1
+                self.stats.record_response(response_ns)
+            
+            self.logger.info("📥 收到 %d 条响应", received)
+            
+        except asyncio.TimeoutError:
+            self.logger.error("❌ 消息响应超时 (%s秒)，已收到 %d/%d 条", self.timeout, received, len(messages))
+        except ConnectionClosedException:
+            self.logger.error("❌ 连接已关闭")
+        except Exception as e:
+            self.logger.error("❌ 批量发送消息失败: %s", e)
+        
+        return received
+
+    def _preview(self, message) -> str:
+        """
+        生成日志用的消息预览
+        
+        只有不超过 PREVIEW_PARSE_MAX_CHARS 的消息才做 JSON 格式化，更大的消息直接截取
+        前 MESSAGE_PREVIEW_CHARS 个字符，预览开销与消息大小无关。
+        """
+        if isinstance(message, bytes):
+            # 二进制帧或未经 UTF-8 校验的文本帧，只解码预览部分
+            return message[:MESSAGE_PREVIEW_CHARS].decode('utf-8', 'replace')
+        if (self.parse_json or self.preview_key is not None) and len(message) <= PREVIEW_PARSE_MAX_CHARS:
+            return self.format_message(message)[:MESSAGE_PREVIEW_CHARS]
+        return message[:MESSAGE_PREVIEW_CHARS]
+
+    def format_message(self, message):
+        """
+        格式化收到的消息用于显示
+        
+        启用 parse_json 时将 JSON 消息解析后以紧凑形式重新输出，无法解析时原样返回。
+        指定 preview_key 时只输出该字段的值；先用子串查找判断字段名是否出现，
+        不可能包含该字段的消息无需解析。
+        """
+        if self._preview_token is not None and isinstance(message, str) and self._preview_token in message:
+            try:
+                data = json_loads(message)
+            except ValueError:
+                data = None
+            if isinstance(data, dict) and self.preview_key in data:
+                return f"{self.preview_key}: {json_dumps(data[self.preview_key])}"
+        if self.parse_json:
+            try:
+                return json_dumps(json_loads(message))
+            except (ValueError, TypeError):
+                pass
+        return message
+
     async def ping_test(self) -> bool:
         """
         执行 WebSocket ping 测试
@@ -272,19 +517,19 @@ class WebSocketProbe:
             return False
             
         try:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             pong_waiter = await self.connection.ping()
             await asyncio.wait_for(pong_waiter, timeout=self.timeout)
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter_ns() - start_ns) / NS_PER_MS
             
-            self.logger.info(f"🏓 Ping 成功，响应时间: {response_time:.2f}ms")
+            self.logger.info("🏓 Ping 成功，响应时间: %.2fms", response_time)
             return True
             
         except asyncio.TimeoutError:
             self.logger.error("❌ Ping 超时")
             return False
         except Exception as e:
-            self.logger.error(f"❌ Ping 失败: {str(e)}")
+            self.logger.error("❌ Ping 失败: %s", e)
             return False
 
     async def http_probe(self) -> Dict[str, Any]:
@@ -301,10 +546,7 @@ class WebSocketProbe:
             # 创建SSL上下文
             ssl_context = None
             if http_url.startswith('https://'):
-                ssl_context = ssl.create_default_context()
-                if self.skip_ssl_verify:
-                    ssl_context.check_hostname = False
-                    ssl_context.verify_mode = ssl.CERT_NONE
+                ssl_context = _make_ssl_context(self.skip_ssl_verify)
             
             connector = aiohttp.TCPConnector(ssl=ssl_context) if ssl_context else None
             
@@ -334,6 +576,22 @@ class WebSocketProbe:
                 'content': None
             }
 
+    @property
+    def is_connected(self) -> bool:
+        """
+        连接是否处于打开状态
+        
+        新版 websockets 的连接对象只提供 state，旧版本提供 closed，
+        按属性是否存在判断，不依赖异常。
+        """
+        connection = self.connection
+        if connection is None:
+            return False
+        state = getattr(connection, 'state', None)
+        if state is not None:
+            return state.name == 'OPEN'
+        return not connection.closed
+
     async def close(self):
         """关闭 WebSocket 连接"""
         if self.connection:
@@ -345,36 +603,63 @@ class WebSocketProbe:
         print("\n" + "="*50)
         print("📊 WebSocket 探测统计")
         print("="*50)
-        print(f"连接尝试次数: {self.stats['connection_attempts']}")
-        print(f"成功连接次数: {self.stats['successful_connections']}")
-        print(f"失败连接次数: {self.stats['failed_connections']}")
-        print(f"发送消息数量: {self.stats['messages_sent']}")
-        print(f"接收消息数量: {self.stats['messages_received']}")
-        
-        if self.stats['messages_received'] > 0:
-            avg_response_time = self.stats['total_response_time'] / self.stats['messages_received']
-            print(f"平均响应时间: {avg_response_time:.2f}ms")
-            print(f"最小响应时间: {self.stats['min_response_time']:.2f}ms")
-            print(f"最大响应时间: {self.stats['max_response_time']:.2f}ms")
-        
-        success_rate = (self.stats['successful_connections'] / self.stats['connection_attempts'] * 100 
-                       if self.stats['connection_attempts'] > 0 else 0)
-        print(f"连接成功率: {success_rate:.1f}%")
+        print(f"连接尝试次数: {self.stats.connection_attempts}")
+        print(f"成功连接次数: {self.stats.successful_connections}")
+        print(f"失败连接次数: {self.stats.failed_connections}")
+        print(f"发送消息数量: {self.stats.messages_sent}")
+        print(f"接收消息数量: {self.stats.messages_received}")
+        
+        if self.stats.messages_received > 0:
+            print(f"平均响应时间: {self.stats.avg_response_time:.2f}ms")
+            print(f"最小响应时间: {self.stats.min_response_time / NS_PER_MS:.2f}ms")
+            print(f"最大响应时间: {self.stats.max_response_time / NS_PER_MS:.2f}ms")
+        
+        print(f"连接成功率: {self.stats.success_rate:.1f}%")
         print("="*50)
 
 class WebSocketProbeRunner:
     def __init__(self):
         self.running = True
+        self.main_task = None
         
     def signal_handler(self, signum, frame):
         """处理中断信号"""
         print("\n\n🛑 收到中断信号，正在停止...")
         self.running = False
 
+    async def run(self, coro):
+        """
+        作为顶层任务运行指定模式的协程
+        
+        POSIX 上由事件循环处理信号，可立即取消正在等待的任务；
+        Windows 的事件循环不支持 add_signal_handler，回退到 signal.signal。
+        """
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError):
+                signal.signal(signum, self.signal_handler)
+        self.main_task = asyncio.current_task()
+        return await coro
+
+    def stop(self):
+        """
+        停止运行并取消顶层任务（由事件循环的信号处理调用）
+        
+        取消会立即打断正在等待的 sleep/recv，而不必等到下一次 IO 才响应中断。
+        """
+        if self.running:
+            print("\n\n🛑 收到中断信号，正在停止...")
+        self.running = False
+        if self.main_task is not None:
+            self.main_task.cancel()
+
     async def basic_probe(self, uri: str, message: str = "ping", headers: Optional[Dict] = None,
-                         skip_ssl_verify: bool = False, debug: bool = False):
+                         skip_ssl_verify: bool = False, debug: bool = False, parse_json: bool = False):
         """基础探测模式"""
-        probe = WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify, debug=debug)
+        probe = WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify, debug=debug,
+                               parse_json=parse_json)
         
         try:
             if await probe.connect():
@@ -415,9 +700,11 @@ class WebSocketProbeRunner:
             probe.print_stats()
 
     async def continuous_probe(self, uri: str, interval: int = 5, message: str = "ping", 
-                             headers: Optional[Dict] = None, skip_ssl_verify: bool = False):
+                             headers: Optional[Dict] = None, skip_ssl_verify: bool = False,
+                             validate_utf8: bool = True, max_size: Optional[int] = DEFAULT_PROBE_MAX_SIZE):
         """连续探测模式"""
-        probe = WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify)
+        probe = WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify,
+                               validate_utf8=validate_utf8, max_size=max_size)
         
         try:
             while self.running:
@@ -438,73 +725,108 @@ class WebSocketProbeRunner:
 
     async def stress_test(self, uri: str, count: int = 10, concurrency: int = 3,
                          message: str = "ping", headers: Optional[Dict] = None, 
-                         skip_ssl_verify: bool = False):
-        """压力测试模式"""
-        print(f"🚀 开始压力测试: {count} 次连接，并发数: {concurrency}")
+                         skip_ssl_verify: bool = False, reuse_connections: bool = True,
+                         batch: int = 1, validate_utf8: bool = True,
+                         max_size: Optional[int] = DEFAULT_PROBE_MAX_SIZE):
+        """
+        压力测试模式
+        
+        count 次测试放入任务队列，由 concurrency 个工作协程依次领取执行。
+        reuse_connections 为 True 时每个工作协程预先建立一个长连接并一直复用，
+        测量的是消息吞吐而不是握手开销；为 False 时每次测试都新建并关闭一个连接。
+        batch 大于 1 时每次测试通过 send_messages 批量发送 batch 条消息。
+        """
+        if concurrency < 1:
+            # 没有工作协程时 jobs.join() 永远不会返回
+            print(f"❌ 错误: 并发数必须大于 0 (当前: {concurrency})")
+            return
+        
+        print(f"🚀 开始压力测试: {count} 次{'测试（复用连接）' if reuse_connections else '连接'}，并发数: {concurrency}")
+        if batch > 1:
+            print(f"📦 每次测试批量发送 {batch} 条消息")
+        
+        async def exercise(probe):
+            if batch > 1:
+                await probe.send_messages([message] * batch)
+            else:
+                await probe.send_message(message)
+        
+        # 每个工作协程持有一个探测器，从任务队列中领取测试，
+        # 总共只创建 concurrency 个任务，而不是为每次测试各创建一个
+        jobs = asyncio.Queue()
+        for _ in range(count):
+            jobs.put_nowait(None)
+        probes = [WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify,
+                                 validate_utf8=validate_utf8, max_size=max_size)
+                  for _ in range(min(concurrency, count))]
         
-        semaphore = asyncio.Semaphore(concurrency)
+        if reuse_connections:
+            # 预先建立长连接，只让连接成功的探测器参与测试
+            connected = await asyncio.gather(*[probe.connect() for probe in probes])
+            active_probes = [probe for probe, ok in zip(probes, connected) if ok]
+        else:
+            active_probes = probes
         
-        async def single_test():
-            async with semaphore:
-                probe = WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify)
+        async def single_cycle(probe):
+            if reuse_connections:
+                await exercise(probe)
+            elif await probe.connect():
                 try:
-                    if await probe.connect():
-                        await probe.send_message(message)
-                    return probe.stats
+                    await exercise(probe)
                 finally:
                     await probe.close()
         
-        # 执行并发测试
-        tasks = [single_test() for _ in range(count)]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def worker(probe):
+            while True:
+                await jobs.get()
+                try:
+                    await single_cycle(probe)
+                except Exception as e:
+                    probe.logger.error("❌ 压力测试出错: %s", e)
+                finally:
+                    jobs.task_done()
+        
+        try:
+            if probes and not active_probes:
+                print("❌ 无可用连接，跳过压力测试")
+            else:
+                workers = [asyncio.ensure_future(worker(probe)) for probe in active_probes]
+                try:
+                    await jobs.join()
+                finally:
+                    for task in workers:
+                        task.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            if reuse_connections:
+                await asyncio.gather(*[probe.close() for probe in probes], return_exceptions=True)
+        results = [probe.stats for probe in probes]
         
         # 汇总统计
-        total_stats = {
-            'connection_attempts': 0,
-            'successful_connections': 0,
-            'failed_connections': 0,
-            'messages_sent': 0,
-            'messages_received': 0,
-            'total_response_time': 0,
-            'min_response_time': float('inf'),
-            'max_response_time': 0
-        }
-        
-        for result in results:
-            if isinstance(result, dict):
-                for key in total_stats:
-                    if key == 'min_response_time':
-                        if result[key] != float('inf'):
-                            total_stats[key] = min(total_stats[key], result[key])
-                    elif key == 'max_response_time':
-                        total_stats[key] = max(total_stats[key], result[key])
-                    else:
-                        total_stats[key] += result[key]
+        total_stats = ProbeStats.aggregate(results)
         
         # 打印汇总统计
         print("\n" + "="*50)
         print("📊 压力测试汇总统计")
         print("="*50)
-        print(f"总连接尝试次数: {total_stats['connection_attempts']}")
-        print(f"总成功连接次数: {total_stats['successful_connections']}")
-        print(f"总失败连接次数: {total_stats['failed_connections']}")
-        print(f"总发送消息数量: {total_stats['messages_sent']}")
-        print(f"总接收消息数量: {total_stats['messages_received']}")
-        
-        if total_stats['messages_received'] > 0:
-            avg_response_time = total_stats['total_response_time'] / total_stats['messages_received']
-            print(f"平均响应时间: {avg_response_time:.2f}ms")
-            if total_stats['min_response_time'] != float('inf'):
-                print(f"最小响应时间: {total_stats['min_response_time']:.2f}ms")
-            print(f"最大响应时间: {total_stats['max_response_time']:.2f}ms")
-        
-        success_rate = (total_stats['successful_connections'] / total_stats['connection_attempts'] * 100 
-                       if total_stats['connection_attempts'] > 0 else 0)
-        print(f"总体连接成功率: {success_rate:.1f}%")
+        print(f"总连接尝试次数: {total_stats.connection_attempts}")
+        print(f"总成功连接次数: {total_stats.successful_connections}")
+        print(f"总失败连接次数: {total_stats.failed_connections}")
+        print(f"总发送消息数量: {total_stats.messages_sent}")
+        print(f"总接收消息数量: {total_stats.messages_received}")
+        
+        if total_stats.messages_received > 0:
+            print(f"平均响应时间: {total_stats.avg_response_time:.2f}ms")
+            if total_stats.min_response_time != float('inf'):
+                print(f"最小响应时间: {total_stats.min_response_time / NS_PER_MS:.2f}ms")
+            print(f"最大响应时间: {total_stats.max_response_time / NS_PER_MS:.2f}ms")
+        
+        print(f"总体连接成功率: {total_stats.success_rate:.1f}%")
         print("="*50)
 
     async def interactive_mode(self, uri: str, headers: Optional[Dict] = None, 
-                              skip_ssl_verify: bool = False, debug: bool = False):
+                              skip_ssl_verify: bool = False, debug: bool = False, parse_json: bool = False,
+                              preview_key: Optional[str] = None):
         """交互式模式 - 建立持久连接并允许实时消息交互"""
         print("🎮 交互式 WebSocket 通道")
         print("=" * 50)
@@ -516,7 +838,10 @@ class WebSocketProbeRunner:
         print("  输入 'help' 查看帮助")
         print("=" * 50)
         
-        probe = WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify, debug=debug)
+        probe = WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify, debug=debug,
+                               parse_json=parse_json, preview_key=preview_key)
+        stdin_transport = None
+        receive_task = None
         
         try:
             # 建立连接
@@ -530,14 +855,13 @@ class WebSocketProbeRunner:
             
             # 启动消息接收任务
             receive_task = asyncio.create_task(self._message_receiver(probe))
+            stdin_reader, stdin_transport = await self._open_stdin_reader()
             
             # 主交互循环
             while True:
                 try:
                     # 获取用户输入
-                    # Python 3.7+ 兼容性：使用 run_in_executor 替代 to_thread
-                    loop = asyncio.get_event_loop()
-                    user_input = await loop.run_in_executor(None, lambda: input("📤 发送: "))
+                    user_input = await self._read_line(stdin_reader, "📤 发送: ")
                     
                     if user_input.lower() in ['quit', 'exit', 'q']:
                         print("👋 退出交互模式...")
@@ -561,7 +885,7 @@ class WebSocketProbeRunner:
                     # 发送用户消息
                     start_time = time.time()
                     await probe.connection.send(user_input)
-                    probe.stats['messages_sent'] += 1
+                    probe.stats.messages_sent += 1
                     
                     print(f"📤 已发送: {user_input}")
                     
@@ -571,28 +895,91 @@ class WebSocketProbeRunner:
                 except Exception as e:
                     print(f"❌ 发送消息时出错: {e}")
                     break
-            
-            # 取消接收任务
-            receive_task.cancel()
-            try:
-                await receive_task
-            except asyncio.CancelledError:
-                pass
                 
         finally:
+            # 取消接收任务（收到信号被取消时同样需要清理）
+            if receive_task is not None:
+                receive_task.cancel()
+                try:
+                    await receive_task
+                except asyncio.CancelledError:
+                    pass
+            if stdin_transport is not None:
+                stdin_transport.close()
+                # 管道传输会把 stdin 设为非阻塞，退出前恢复，避免影响终端中的后续程序
+                os.set_blocking(sys.stdin.fileno(), True)
             await probe.close()
             print("\n📊 最终统计信息:")
             probe.print_stats()
 
+    async def _open_stdin_reader(self):
+        """
+        将 stdin 接入事件循环，返回 (StreamReader, transport)
+        
+        只用于管道等非终端输入，读取时不占用线程池。stdin 是终端时不使用：
+        管道传输会给终端的文件描述（与 stdout/stderr 共享）设置 O_NONBLOCK，
+        接收任务快速 print 时可能抛出 BlockingIOError。终端、Windows 或无法接入
+        事件循环（如重定向自普通文件）时返回 (None, None)，由 _read_line 回退到
+        run_in_executor + input()。
+        """
+        if sys.platform == 'win32' or os.isatty(sys.stdin.fileno()):
+            return None, None
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+        protocol = asyncio.StreamReaderProtocol(reader)
+        # 使用复制的文件描述符，关闭传输时不会连带关闭 sys.stdin
+        stdin_pipe = os.fdopen(os.dup(sys.stdin.fileno()), 'rb', buffering=0)
+        try:
+            transport, _ = await loop.connect_read_pipe(lambda: protocol, stdin_pipe)
+        except (OSError, ValueError, NotImplementedError):
+            stdin_pipe.close()
+            return None, None
+        return reader, transport
+
+    async def _read_line(self, reader: Optional[asyncio.StreamReader], prompt: str) -> str:
+        """显示提示符并读取一行用户输入，stdin 关闭时抛出 EOFError"""
+        if reader is None:
+            # Python 3.7+ 兼容性：使用 run_in_executor 替代 to_thread
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, input, prompt)
+        
+        print(prompt, end="", flush=True)
+        try:
+            line = await reader.readuntil(b'\n')
+        except asyncio.IncompleteReadError as e:
+            # 最后一行没有换行符
+            line = e.partial
+        except asyncio.LimitOverrunError as e:
+            # 超长的一行：丢弃其余部分并提示，而不是结束交互会话
+            await self._skip_long_line(reader, e.consumed)
+            print(f"\n❌ 输入过长（超过 {STDIN_LINE_LIMIT} 字节），已忽略")
+            return ''
+        if not line:
+            raise EOFError
+        return line.decode('utf-8', 'replace').rstrip('\r\n')
+
+    @staticmethod
+    async def _skip_long_line(reader: asyncio.StreamReader, consumed: int):
+        """丢弃超过读取上限的一行，直到读到换行符或 stdin 关闭"""
+        while True:
+            try:
+                await reader.readexactly(consumed)
+                await reader.readuntil(b'\n')
+                return
+            except asyncio.LimitOverrunError as e:
+                consumed = e.consumed
+            except asyncio.IncompleteReadError:
+                return
+
     async def _message_receiver(self, probe: 'WebSocketProbe'):
         """后台任务：接收 WebSocket 消息"""
         try:
             while True:
                 try:
                     message = await probe.connection.recv()
-                    probe.stats['messages_received'] += 1
+                    probe.stats.messages_received += 1
                     timestamp = time.strftime("%H:%M:%S")
-                    print(f"\n📥 [{timestamp}] 收到: {message}")
+                    print(f"\n📥 [{timestamp}] 收到: {probe.format_message(message)}")
                     print("📤 发送: ", end="", flush=True)  # 重新显示提示符
                 except ConnectionClosedException:
                     print("\n🔌 WebSocket 连接已关闭")
@@ -606,13 +993,9 @@ class WebSocketProbeRunner:
     def _print_interactive_stats(self, probe: 'WebSocketProbe'):
         """打印交互模式的实时统计信息"""
         print("\n📊 实时统计信息:")
-        print(f"  发送消息数: {probe.stats['messages_sent']}")
-        print(f"  接收消息数: {probe.stats['messages_received']}")
-        try:
-            connected = probe.connection and not probe.connection.closed
-        except:
-            connected = probe.connection is not None
-        print(f"  连接状态: {'✅ 已连接' if connected else '❌ 已断开'}")
+        print(f"  发送消息数: {probe.stats.messages_sent}")
+        print(f"  接收消息数: {probe.stats.messages_received}")
+        print(f"  连接状态: {'✅ 已连接' if probe.is_connected else '❌ 已断开'}")
         
     def _print_interactive_help(self):
         """打印交互模式帮助信息"""
@@ -631,6 +1014,41 @@ class WebSocketProbeRunner:
         print("  - 查看连接状态: stats")
         print()
 
+def get_uvloop():
+    """
+    获取 uvloop 模块（如果可用）
+    
+    uvloop 基于 libuv，替换了默认的 selector 事件循环和传输层，减少每次 send/recv 的开销。
+    uvloop 为可选依赖，未安装（或在 Windows 上）时返回 None，使用默认事件循环。
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop
+
+def run_async(coro, debug: bool = False, uvloop=None):
+    """
+    在新的事件循环中运行顶层协程，结束时由 asyncio 取消剩余任务并关闭事件循环
+    
+    Python 3.11+ 通过 asyncio.Runner 的 loop_factory 直接创建 uvloop 事件循环，
+    旧版本通过事件循环策略安装 uvloop 后使用 asyncio.run。
+    """
+    if hasattr(asyncio, 'Runner'):
+        loop_factory = uvloop.new_event_loop if uvloop is not None else None
+        with asyncio.Runner(debug=debug, loop_factory=loop_factory) as runner:
+            return runner.run(coro)
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro, debug=debug)
+
+def positive_int(value: str) -> int:
+    """argparse 类型：大于 0 的整数"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须为大于 0 的整数: {value}")
+    return number
+
 def main():
     parser = argparse.ArgumentParser(description='WebSocket 探测工具')
     parser.add_argument('uri', help='WebSocket 服务器地址 (例如: ws://localhost:8080/ws)')
@@ -641,25 +1059,53 @@ def main():
                        help='连续模式下的间隔时间秒数 (默认: 5)')
     parser.add_argument('--count', type=int, default=10, 
                        help='压力测试模式下的连接次数 (默认: 10)')
-    parser.add_argument('--concurrency', type=int, default=3, 
+    parser.add_argument('--concurrency', type=positive_int, default=3, 
                        help='压力测试模式下的并发数 (默认: 3)')
-    parser.add_argument('--headers', help='JSON格式的HTTP头部 (例如: \'{"Authorization": "Bearer token"}\')')
+    parser.add_argument('--batch', type=int, default=1,
+                       help='压力测试模式下每次测试批量发送的消息数 (默认: 1)')
+    parser.add_argument('--reuse-connections', dest='reuse_connections', action='store_true', default=True,
+                       help='压力测试模式下复用 concurrency 个长连接 (默认启用)')
+    parser.add_argument('--no-reuse-connections', dest='reuse_connections', action='store_false',
+                       help='压力测试模式下每次测试都新建连接，用于测量握手开销')
+    parser.add_argument('-H', '--header', dest='header', action='append', default=[], metavar='KEY:VALUE',
+                       help='HTTP头部，可重复指定 (例如: -H "Authorization: Bearer token")')
+    parser.add_argument('--headers', help='JSON格式的HTTP头部 (已弃用，请使用 -H；例如: \'{"Authorization": "Bearer token"}\')')
     parser.add_argument('--timeout', type=int, default=5, help='超时时间秒数 (默认: 5)')
     parser.add_argument('--skip-ssl-verify', action='store_true', 
                        help='跳过SSL证书验证 (仅用于测试环境，有安全风险)')
     parser.add_argument('--debug', action='store_true', 
                        help='启用调试模式，显示详细的诊断信息')
+    parser.add_argument('--parse-json', action='store_true',
+                       help='基础/交互模式下将收到的 JSON 消息解析后显示 (安装 orjson 时使用 orjson)')
+    parser.add_argument('--preview-key', metavar='KEY',
+                       help='交互模式下只显示收到的 JSON 消息中该顶层字段的值 (例如: --preview-key ts)')
+    parser.add_argument('--no-utf8-validation', dest='validate_utf8', action='store_false',
+                       help='连续/压力测试模式下不对响应做 UTF-8 解码校验，以原始字节接收 '
+                            '(仅用于可信服务器的性能测试，非法 UTF-8 数据不会被发现)')
+    parser.add_argument('--max-size', type=int, default=DEFAULT_PROBE_MAX_SIZE,
+                       help=f'连续/压力测试模式下接收单条消息的最大字节数，超出时断开连接 (默认: {DEFAULT_PROBE_MAX_SIZE})')
     
     args = parser.parse_args()
     
-    # 解析头部
+    # 解析头部：兼容已弃用的 --headers JSON，-H 指定的同名头部优先
     headers = None
     if args.headers:
         try:
-            headers = json.loads(args.headers)
-        except json.JSONDecodeError:
+            headers = json_loads(args.headers)
+        except ValueError:  # json.JSONDecodeError 与 orjson.JSONDecodeError 均为 ValueError 子类
             print("❌ 错误: 无法解析headers JSON格式")
             return 1
+        if not isinstance(headers, dict):
+            print("❌ 错误: headers 必须是 JSON 对象")
+            return 1
+    if args.header:
+        malformed = [h for h in args.header if ':' not in h]
+        if malformed:
+            print(f"❌ 错误: 头部格式应为 KEY:VALUE: {malformed[0]}")
+            return 1
+        headers = dict(headers or {})
+        headers.update((key.strip(), value.strip())
+                       for key, value in (h.split(':', 1) for h in args.header))
     
     # 验证URI格式
     parsed_uri = urlparse(args.uri)
@@ -669,10 +1115,6 @@ def main():
     
     runner = WebSocketProbeRunner()
     
-    # 设置信号处理
-    signal.signal(signal.SIGINT, runner.signal_handler)
-    signal.signal(signal.SIGTERM, runner.signal_handler)
-    
     print(f"🔍 WebSocket 探测工具启动")
     print(f"🎯 目标地址: {args.uri}")
     print(f"🔧 模式: {args.mode}")
@@ -683,21 +1125,29 @@ def main():
         print(f"⚠️ SSL证书验证: 已禁用（仅用于测试环境）")
     if args.debug:
         print(f"🔍 调试模式: 已启用")
+    if not args.validate_utf8:
+        print("⚠️ UTF-8 校验: 已禁用（仅用于性能测试）")
     print("-" * 50)
     
+    uvloop = get_uvloop()
+    if uvloop is not None:
+        print("⚡ 已启用 uvloop 事件循环")
+    
     try:
-        # Python 3.6 兼容性：使用 get_event_loop().run_until_complete() 替代 asyncio.run()
-        loop = asyncio.get_event_loop()
-        
         if args.mode == 'basic':
-            loop.run_until_complete(runner.basic_probe(args.uri, args.message, headers, args.skip_ssl_verify, args.debug))
+            coro = runner.basic_probe(args.uri, args.message, headers, args.skip_ssl_verify, args.debug, args.parse_json)
         elif args.mode == 'continuous':
-            loop.run_until_complete(runner.continuous_probe(args.uri, args.interval, args.message, headers, args.skip_ssl_verify))
+            coro = runner.continuous_probe(args.uri, args.interval, args.message, headers, args.skip_ssl_verify,
+                                           args.validate_utf8, args.max_size)
         elif args.mode == 'stress':
-            loop.run_until_complete(runner.stress_test(args.uri, args.count, args.concurrency, args.message, headers, args.skip_ssl_verify))
+            coro = runner.stress_test(args.uri, args.count, args.concurrency, args.message, headers, args.skip_ssl_verify,
+                                      args.reuse_connections, args.batch, args.validate_utf8, args.max_size)
         elif args.mode == 'interactive':
-            loop.run_until_complete(runner.interactive_mode(args.uri, headers, args.skip_ssl_verify, args.debug))
-    except KeyboardInterrupt:
+            coro = runner.interactive_mode(args.uri, headers, args.skip_ssl_verify, args.debug, args.parse_json,
+                                           args.preview_key)
+        
+        run_async(runner.run(coro), debug=args.debug, uvloop=uvloop)
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("\n🛑 程序被用户中断")
         return 0
     except Exception as e:
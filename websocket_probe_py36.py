@@ -5,17 +5,55 @@ WebSocket 探测工具 (Python 3.6 兼容版本)
 """
 
 import asyncio
+import codecs
 import websockets
+import importlib.util
+import inspect
 import json
 import time
 import argparse
 import logging
 import ssl
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 from urllib.parse import urlparse
 import signal
 import sys
 import aiohttp
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+
+# 可选的 orjson 加速 JSON 解析/序列化，未安装时使用标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    """解析 JSON（orjson 可用时使用 orjson）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj) -> str:
+    """序列化为 JSON 字符串（orjson 可用时使用 orjson）"""
+    if orjson is not None:
+        # orjson 返回 bytes；解码为 str 以便按文本帧发送
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+# 超时上下文管理器：避免 asyncio.wait_for 每次调用额外创建 Future 和回调
+try:
+    from asyncio import timeout as async_timeout  # Python 3.11+
+except ImportError:
+    from async_timeout import timeout as async_timeout
+
+# 设置日志：只在模块导入时配置一次，而不是每创建一个探测实例都调用 basicConfig
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
 
 # 兼容性异常处理
 class WebSocketExceptions:
@@ -59,7 +97,128 @@ InvalidStatusException = WebSocketExceptions.get_invalid_status_exception()
 InvalidHandshakeException = WebSocketExceptions.get_invalid_handshake_exception()
 ConnectionClosedException = WebSocketExceptions.get_connection_closed_exception()
 
+def get_connect_headers_kwarg() -> Optional[str]:
+    """
+    检测 websockets.connect 传递自定义头部所用的参数名
+    
+    websockets 14+ 使用 additional_headers，旧版本使用 extra_headers。
+    
+    Returns:
+        str: 参数名，都不支持时返回 None
+    """
+    try:
+        parameters = inspect.signature(websockets.connect).parameters
+    except (TypeError, ValueError):
+        return None
+    for name in ('additional_headers', 'extra_headers'):
+        if name in parameters:
+            return name
+    return None
+
+# 在导入时检测一次，避免每次连接都通过 TypeError 试探参数名
+CONNECT_HEADERS_KWARG = get_connect_headers_kwarg()
+
+def get_send_bytes_as_text_supported() -> bool:
+    """
+    检测连接的 send 是否支持 text=True（以文本帧发送已编码的 UTF-8 字节）
+    
+    websockets 14+ 的 asyncio 实现支持该参数；旧版本发送 bytes 时只能作为二进制帧。
+    """
+    try:
+        from websockets.asyncio.client import ClientConnection, connect
+    except ImportError:
+        return False
+    if websockets.connect is not connect:
+        return False
+    try:
+        return 'text' in inspect.signature(ClientConnection.send).parameters
+    except (TypeError, ValueError):
+        return False
+
+SEND_BYTES_AS_TEXT = get_send_bytes_as_text_supported()
+
+class ProbeStats:
+    """探测统计信息（使用 __slots__ 固定字段，属性访问比字典下标更快）"""
+    
+    __slots__ = (
+        'connection_attempts',
+        'successful_connections',
+        'failed_connections',
+        'messages_sent',
+        'messages_received',
+        'total_response_time',
+        'min_response_time',
+        'max_response_time',
+    )
+    
+    # 汇总时直接求和的字段
+    SUM_FIELDS = __slots__[:6]
+    
+    def __init__(self):
+        self.connection_attempts = 0
+        self.successful_connections = 0
+        self.failed_connections = 0
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.total_response_time = 0
+        self.min_response_time = float('inf')
+        self.max_response_time = 0
+    
+    def record_response(self, response_time: float):
+        """记录一次收到的响应"""
+        self.messages_received += 1
+        self.total_response_time += response_time
+        if response_time < self.min_response_time:
+            self.min_response_time = response_time
+        if response_time > self.max_response_time:
+            self.max_response_time = response_time
+    
+    @property
+    def avg_response_time(self) -> float:
+        """平均响应时间（毫秒），未收到响应时为 0"""
+        if not self.messages_received:
+            return 0.0
+        return self.total_response_time / self.messages_received
+    
+    @property
+    def success_rate(self) -> float:
+        """连接成功率（百分比），未尝试连接时为 0"""
+        if not self.connection_attempts:
+            return 0.0
+        return self.successful_connections / self.connection_attempts * 100
+    
+    @classmethod
+    def aggregate(cls, stats_list: List['ProbeStats']) -> 'ProbeStats':
+        """
+        汇总多个探测器的统计信息
+        
+        先用一次 attrgetter 取出每个对象的全部字段，再 zip 转置成按字段排列的列，
+        每列交给内置的 sum/min/max 一次性归约，避免逐字段重复遍历整个列表。
+        """
+        total = cls()
+        if not stats_list:
+            return total
+        columns = list(zip(*map(_STATS_GETTER, stats_list)))
+        for field, column in zip(cls.SUM_FIELDS, columns):
+            setattr(total, field, sum(column))
+        min_column, max_column = columns[len(cls.SUM_FIELDS):]
+        total.min_response_time = min(min_column)
+        total.max_response_time = max(max_column)
+        return total
+
+_STATS_GETTER = attrgetter(*ProbeStats.__slots__)
+
+# HTTP 探测时显示的响应内容预览字符数
+HTTP_PREVIEW_CHARS = 500
+# 为预览读取的最大字节数：UTF-8 每个字符最多 4 字节
+HTTP_PREVIEW_BYTES = HTTP_PREVIEW_CHARS * 4
+
 class WebSocketProbe:
+    # 按是否跳过证书验证缓存 SSL 上下文，避免每次连接都重新加载系统证书
+    _SSL_CTX_CACHE: Dict[bool, ssl.SSLContext] = {}
+    # 按 (是否跳过证书验证, 超时) 缓存 HTTP 会话，复用其连接池和 DNS 缓存
+    _SESSION_CACHE: Dict[Tuple[bool, int], aiohttp.ClientSession] = {}
+    
     def __init__(self, uri: str, timeout: int = 5, headers: Optional[Dict[str, str]] = None, 
                  skip_ssl_verify: bool = False, debug: bool = False):
         """
@@ -78,25 +237,42 @@ class WebSocketProbe:
         self.skip_ssl_verify = skip_ssl_verify
         self.debug = debug
         self.connection = None
-        self.stats = {
-            'connection_attempts': 0,
-            'successful_connections': 0,
-            'failed_connections': 0,
-            'messages_sent': 0,
-            'messages_received': 0,
-            'total_response_time': 0,
-            'min_response_time': float('inf'),
-            'max_response_time': 0
-        }
-        
-        # 设置日志
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        self.stats = ProbeStats()
         self.logger = logging.getLogger(__name__)
 
+    @classmethod
+    def _ssl_context(cls, skip_verify: bool) -> ssl.SSLContext:
+        """获取（并缓存）SSL 上下文"""
+        ssl_context = cls._SSL_CTX_CACHE.get(skip_verify)
+        if ssl_context is None:
+            ssl_context = ssl.create_default_context()
+            if skip_verify:
+                # 跳过证书验证（仅用于测试环境）
+                ssl_context.check_hostname = False
+                ssl_context.verify_mode = ssl.CERT_NONE
+            cls._SSL_CTX_CACHE[skip_verify] = ssl_context
+        return ssl_context
+
+    @classmethod
+    def _session(cls, skip_verify: bool, timeout: int) -> aiohttp.ClientSession:
+        """获取（并缓存）HTTP 会话，必须在事件循环中调用"""
+        key = (skip_verify, timeout)
+        session = cls._SESSION_CACHE.get(key)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(ssl=cls._ssl_context(skip_verify), limit=100,
+                                             ttl_dns_cache=300, keepalive_timeout=30)
+            session = aiohttp.ClientSession(connector=connector,
+                                            timeout=aiohttp.ClientTimeout(total=timeout))
+            cls._SESSION_CACHE[key] = session
+        return session
+
+    @classmethod
+    async def close_sessions(cls):
+        """关闭所有缓存的 HTTP 会话"""
+        sessions = list(cls._SESSION_CACHE.values())
+        cls._SESSION_CACHE.clear()
+        await asyncio.gather(*[session.close() for session in sessions], return_exceptions=True)
+
     async def connect(self) -> bool:
         """
         连接到 WebSocket 服务器
@@ -105,86 +281,54 @@ class WebSocketProbe:
             bool: 连接是否成功
         """
         try:
-            self.stats['connection_attempts'] += 1
-            self.logger.info("正在连接到 {}...".format(self.uri))
+            self.stats.connection_attempts += 1
+            self.logger.info("正在连接到 %s...", self.uri)
             
-            if self.debug:
-                self.logger.info("🔍 调试模式: 超时={}秒, 头部={}".format(self.timeout, self.headers))
+            # 日志参数使用 % 占位符延迟格式化，仅在记录实际输出时才拼接字符串
+            if self.debug and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("🔍 调试模式: 超时=%s秒, 头部=%s", self.timeout, self.headers)
             
             # 处理 SSL 设置
             ssl_context = None
             if self.uri.startswith('wss://'):
-                ssl_context = ssl.create_default_context()
+                ssl_context = self._ssl_context(self.skip_ssl_verify)
                 if self.skip_ssl_verify:
-                    # 跳过证书验证（仅用于测试环境）
-                    ssl_context.check_hostname = False
-                    ssl_context.verify_mode = ssl.CERT_NONE
                     self.logger.warning("⚠️ 已禁用SSL证书验证（仅用于测试环境）")
                     
-                if self.debug:
-                    self.logger.info("🔍 SSL设置: verify={}".format(not self.skip_ssl_verify))
+                if self.debug and self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("🔍 SSL设置: verify=%s", not self.skip_ssl_verify)
             
-            # 处理 websockets 库版本兼容性
-            try:
-                # 尝试使用新版本的参数名
-                self.connection = await asyncio.wait_for(
-                    websockets.connect(
-                        self.uri,
-                        additional_headers=self.headers,
-                        ssl=ssl_context,
-                        ping_interval=20,
-                        ping_timeout=10
-                    ),
-                    timeout=self.timeout
-                )
-            except TypeError as e:
-                if 'additional_headers' in str(e):
-                    # 如果 additional_headers 不支持，尝试 extra_headers
-                    try:
-                        self.connection = await asyncio.wait_for(
-                            websockets.connect(
-                                self.uri,
-                                extra_headers=self.headers,
-                                ssl=ssl_context,
-                                ping_interval=20,
-                                ping_timeout=10
-                            ),
-                            timeout=self.timeout
-                        )
-                    except TypeError as e2:
-                        if 'extra_headers' in str(e2):
-                            # 如果都不支持，则不传递头部
-                            self.logger.warning("⚠️ 当前 websockets 版本不支持自定义头部，将忽略头部设置")
-                            self.connection = await asyncio.wait_for(
-                                websockets.connect(
-                                    self.uri,
-                                    ssl=ssl_context,
-                                    ping_interval=20,
-                                    ping_timeout=10
-                                ),
-                                timeout=self.timeout
-                            )
-                        else:
-                            raise e2
+            # 处理 websockets 库版本兼容性：头部参数名已在导入时检测
+            connect_kwargs = {
+                'ssl': ssl_context,
+                'ping_interval': 20,
+                'ping_timeout': 10
+            }
+            if self.headers:
+                if CONNECT_HEADERS_KWARG:
+                    connect_kwargs[CONNECT_HEADERS_KWARG] = self.headers
                 else:
-                    raise e
+                    self.logger.warning("⚠️ 当前 websockets 版本不支持自定义头部，将忽略头部设置")
             
-            self.stats['successful_connections'] += 1
+            async with async_timeout(self.timeout):
+                self.connection = await websockets.connect(self.uri, **connect_kwargs)
+            
+            self.stats.successful_connections += 1
             self.logger.info("✅ WebSocket 连接成功建立")
             return True
             
         except asyncio.TimeoutError:
-            self.stats['failed_connections'] += 1
-            self.logger.error("❌ 连接超时 ({}秒)".format(self.timeout))
+            self.stats.failed_connections += 1
+            self.logger.error("❌ 连接超时 (%s秒)", self.timeout)
             return False
         except InvalidStatusException as e:
-            self.stats['failed_connections'] += 1
+            self.stats.failed_connections += 1
             # 兼容不同版本的 websockets 库
             status_code = getattr(e, 'status_code', None) or getattr(e, 'response', None)
             if hasattr(status_code, 'status_code'):
                 status_code = status_code.status_code
             status_code = status_code or 'Unknown'
-            self.logger.error("❌ 连接失败，状态码: {}".format(status_code))
+            self.logger.error("❌ 连接失败，状态码: %s", status_code)
             
             # 如果是状态码 200，可能是普通 HTTP 服务
             if status_code == 200:
@@ -193,20 +337,29 @@ class WebSocketProbe:
             
             return False
         except InvalidHandshakeException as e:
-            self.stats['failed_connections'] += 1
-            self.logger.error("❌ 握手失败: {}".format(str(e)))
+            self.stats.failed_connections += 1
+            self.logger.error("❌ 握手失败: %s", e)
             return False
         except Exception as e:
-            self.stats['failed_connections'] += 1
-            self.logger.error("❌ 连接失败: {}".format(str(e)))
+            self.stats.failed_connections += 1
+            self.logger.error("❌ 连接失败: %s", e)
             return False
 
-    async def send_message(self, message: str) -> bool:
+    async def _send(self, message: Union[str, bytes]):
+        """发送一条文本消息；bytes 视为已编码的 UTF-8 文本"""
+        if isinstance(message, bytes):
+            await self.connection.send(message, text=True)
+        else:
+            await self.connection.send(message)
+
+    async def send_message(self, message: Union[str, bytes], expect_response: bool = True) -> bool:
         """
         发送消息到 WebSocket 服务器
         
         Args:
-            message: 要发送的消息
+            message: 要发送的消息（bytes 仅在 SEND_BYTES_AS_TEXT 为 True 时使用）
+            expect_response: 是否等待服务器响应；为 False 时只计入发送数，
+                不记录响应时间统计
             
         Returns:
             bool: 发送是否成功
@@ -216,27 +369,27 @@ class WebSocketProbe:
             return False
             
         try:
-            self.logger.info("📤 发送消息: {}...".format(message[:100]))
+            preview = message[:100]
+            if isinstance(preview, bytes):
+                preview = preview.decode('utf-8', 'replace')
+            self.logger.info("📤 发送消息: {}...".format(preview))
             start_time = time.time()
             
-            await asyncio.wait_for(
-                self.connection.send(message),
-                timeout=self.timeout
-            )
+            async with async_timeout(self.timeout):
+                await self._send(message)
+            
+            if not expect_response:
+                self.stats.messages_sent += 1
+                return True
             
             # 等待响应
             try:
-                response = await asyncio.wait_for(
-                    self.connection.recv(),
-                    timeout=self.timeout
-                )
+                async with async_timeout(self.timeout):
+                    response = await self.connection.recv()
                 
                 response_time = (time.time() - start_time) * 1000
-                self.stats['messages_sent'] += 1
-                self.stats['messages_received'] += 1
-                self.stats['total_response_time'] += response_time
-                self.stats['min_response_time'] = min(self.stats['min_response_time'], response_time)
-                self.stats['max_response_time'] = max(self.stats['max_response_time'], response_time)
+                self.stats.messages_sent += 1
+                self.stats.record_response(response_time)
                 
                 self.logger.info("📥 收到响应 ({:.2f}ms): {}...".format(response_time, response[:100]))
                 return True
@@ -249,6 +402,66 @@ class WebSocketProbe:
             self.logger.error("❌ 发送消息失败: {}".format(str(e)))
             return False
 
+    async def send_json(self, obj: Any) -> bool:
+        """
+        将对象序列化为 JSON 后发送并测量响应时间
+        
+        Args:
+            obj: 可 JSON 序列化的对象
+            
+        Returns:
+            bool: 发送是否成功
+        """
+        return await self.send_message(json_dumps(obj))
+
+    async def send_many(self, messages: List[Union[str, bytes]], expect_response: bool = True) -> int:
+        """
+        批量发送消息并接收对应的响应
+        
+        所有消息先一次性并发写出（websockets 的 send 不需要往返事件循环），
+        再依次接收响应；websockets 不允许在同一连接上并发调用 recv。
+        
+        Args:
+            messages: 要发送的消息列表
+            expect_response: 是否等待服务器响应；为 False 时只计入发送数，
+                不记录响应时间统计
+            
+        Returns:
+            int: 收到的响应数量（不等待响应时为发送的消息数量）
+        """
+        if not self.connection:
+            self.logger.error("❌ 未连接到 WebSocket 服务器")
+            return 0
+        
+        received = 0
+        try:
+            self.logger.info("📤 批量发送 {} 条消息".format(len(messages)))
+            start_time = time.time()
+            
+            async with async_timeout(self.timeout):
+                await asyncio.gather(*[self._send(message) for message in messages])
+            self.stats.messages_sent += len(messages)
+            if not expect_response:
+                return len(messages)
+            
+            # 等待全部响应，响应时间从整批发送开始计算
+            async with async_timeout(self.timeout):
+                for _ in messages:
+                    await self.connection.recv()
+                    response_time = (time.time() - start_time) * 1000
+                    received += 1
+                    self.stats.record_response(response_time)
+            
+            self.logger.info("📥 收到 {} 条响应".format(received))
+            
+        except asyncio.TimeoutError:
+            self.logger.error("❌ 批量消息响应超时 ({}秒)，已收到 {}/{} 条".format(
+                self.timeout, received, len(messages)))
+        except Exception as e:
+            self.logger.error("❌ 批量发送消息失败: {}".format(str(e)))
+        
+        return received
+
     async def ping_test(self) -> bool:
         """
         执行 Ping 测试
@@ -263,7 +476,8 @@ class WebSocketProbe:
         try:
             start_time = time.time()
             pong_waiter = await self.connection.ping()
-            await asyncio.wait_for(pong_waiter, timeout=self.timeout)
+            async with async_timeout(self.timeout):
+                await pong_waiter
             response_time = (time.time() - start_time) * 1000
             
             self.logger.info("🏓 Ping 成功，响应时间: {:.2f}ms".format(response_time))
@@ -273,6 +487,19 @@ class WebSocketProbe:
             self.logger.error("❌ Ping 失败: {}".format(str(e)))
             return False
 
+    async def discard_incoming(self):
+        """
+        持续读取并丢弃收到的消息，直到连接关闭或任务被取消
+        
+        只发送不等待响应时，服务器回显的消息无人读取；接收队列填满后 websockets
+        会停止读取套接字，ping 的 pong 也随之积压，导致 ping 超时或连接断开。
+        """
+        try:
+            while True:
+                await self.connection.recv()
+        except ConnectionClosedException:
+            pass
+
     async def close(self):
         """关闭 WebSocket 连接"""
         if self.connection:
@@ -284,21 +511,19 @@ class WebSocketProbe:
         print("=" * 50)
         print("📊 WebSocket 探测统计")
         print("=" * 50)
-        print("连接尝试次数: {}".format(self.stats['connection_attempts']))
-        print("成功连接次数: {}".format(self.stats['successful_connections']))
-        print("失败连接次数: {}".format(self.stats['failed_connections']))
-        print("发送消息数量: {}".format(self.stats['messages_sent']))
-        print("接收消息数量: {}".format(self.stats['messages_received']))
-        
-        if self.stats['messages_received'] > 0:
-            avg_response_time = self.stats['total_response_time'] / self.stats['messages_received']
-            print("平均响应时间: {:.2f}ms".format(avg_response_time))
-            print("最小响应时间: {:.2f}ms".format(self.stats['min_response_time']))
-            print("最大响应时间: {:.2f}ms".format(self.stats['max_response_time']))
-        
-        if self.stats['connection_attempts'] > 0:
-            success_rate = (self.stats['successful_connections'] / self.stats['connection_attempts']) * 100
-            print("连接成功率: {:.1f}%".format(success_rate))
+        print("连接尝试次数: {}".format(self.stats.connection_attempts))
+        print("成功连接次数: {}".format(self.stats.successful_connections))
+        print("失败连接次数: {}".format(self.stats.failed_connections))
+        print("发送消息数量: {}".format(self.stats.messages_sent))
+        print("接收消息数量: {}".format(self.stats.messages_received))
+        
+        if self.stats.messages_received > 0:
+            print("平均响应时间: {:.2f}ms".format(self.stats.avg_response_time))
+            print("最小响应时间: {:.2f}ms".format(self.stats.min_response_time))
+            print("最大响应时间: {:.2f}ms".format(self.stats.max_response_time))
+        
+        if self.stats.connection_attempts > 0:
+            print("连接成功率: {:.1f}%".format(self.stats.success_rate))
         print("=" * 50)
 
     async def http_probe(self) -> Dict[str, Any]:
@@ -308,35 +533,58 @@ class WebSocketProbe:
         Returns:
             Dict: HTTP 响应信息
         """
-        http_url = self.uri.replace('ws://', 'http://').replace('wss://', 'https://')
+        # 协议只会出现在开头，按前缀替换即可，无需扫描整个字符串
+        if self.uri.startswith('wss://'):
+            http_url = 'https://' + self.uri[6:]
+        elif self.uri.startswith('ws://'):
+            http_url = 'http://' + self.uri[5:]
+        else:
+            http_url = self.uri
         try:
-            ssl_context = None
-            if http_url.startswith('https://'):
-                ssl_context = ssl.create_default_context()
-                if self.skip_ssl_verify:
-                    ssl_context.check_hostname = False
-                    ssl_context.verify_mode = ssl.CERT_NONE
-            connector = aiohttp.TCPConnector(ssl=ssl_context) if ssl_context else None
-            async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
-                async with session.get(http_url, headers=self.headers) as response:
-                    result = {
-                        'status_code': response.status,
-                        'headers': dict(response.headers),
-                        'content_type': response.content_type,
-                        'url': str(response.url)
-                    }
+            session = self._session(self.skip_ssl_verify, self.timeout)
+            async with session.get(http_url, headers=self.headers) as response:
+                result = {
+                    'status_code': response.status,
+                    'headers': dict(response.headers),
+                    'content_type': response.content_type,
+                    'url': str(response.url)
+                }
+                try:
+                    # 只读取预览所需的前若干字节，避免把整个响应体读入内存再截断
+                    try:
+                        raw = await response.content.readexactly(HTTP_PREVIEW_BYTES)
+                    except asyncio.IncompleteReadError as e:
+                        raw = e.partial
                     try:
-                        content = await response.text()
-                        result['content'] = content[:500] if len(content) > 500 else content
-                    except:
-                        result['content'] = "无法读取响应内容"
-                    return result
+                        decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+                    except LookupError:
+                        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                    # 不以 final=True 结束解码，末尾被截断的多字节字符留在解码器中，不会变成乱码
+                    result['content'] = decoder.decode(raw)[:HTTP_PREVIEW_CHARS]
+                except:
+                    result['content'] = "无法读取响应内容"
+                return result
         except Exception as e:
             return {'error': str(e), 'status_code': None, 'headers': {}, 'content': None}
 
 class WebSocketProbeRunner:
     def __init__(self):
         self.running = True
+        # 交互模式专用的输入线程（线程按需创建），避免占用默认线程池
+        self._input_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ws-input')
+        # 交互模式命令表：处理函数返回 False 表示退出交互模式
+        self._commands = {
+            'ping': self._cmd_ping,
+            'stats': self._cmd_stats,
+            'help': self._cmd_help,
+            'quit': self._cmd_quit,
+            'exit': self._cmd_quit,
+            'q': self._cmd_quit,
+        }
+        self._command_max_len = max(len(name) for name in self._commands)
+        # 接收消息时间戳缓存：同一秒内复用已格式化的字符串
+        self._last_sec = -1
+        self._last_ts = ''
         
     def signal_handler(self, signum, frame):
         """信号处理器"""
@@ -366,7 +614,7 @@ class WebSocketProbeRunner:
                         
                 content = http_result.get('content', '')
                 if content:
-                    print("响应内容前500字符:")
+                    print("响应内容前{}字符:".format(HTTP_PREVIEW_CHARS))
                     print("  {}".format(content))
             return
             
@@ -400,77 +648,122 @@ class WebSocketProbeRunner:
         probe.print_stats()
 
     async def stress_test(self, uri: str, count: int, concurrency: int, message: str,
-                         headers: Optional[Dict] = None, skip_ssl_verify: bool = False):
-        """压力测试模式"""
-        print("🚀 开始压力测试: {} 次连接，并发数: {}".format(count, concurrency))
+                         headers: Optional[Dict] = None, skip_ssl_verify: bool = False,
+                         batch: int = 1, reuse_connections: bool = True,
+                         wait_response: bool = True):
+        """
+        压力测试模式
         
-        async def single_test():
-            probe = WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify)
-            if await probe.connect():
-                await probe.ping_test()
-                await probe.send_message(message)
-                await probe.close()
-            return probe.stats
+        reuse_connections 为 True 时预先建立 concurrency 个长连接组成连接池，
+        count 次测试轮流复用这些连接，测量的是消息吞吐而不是握手开销；
+        为 False 时每次测试都新建并关闭一个连接。
+        wait_response 为 False 时只发送不等待响应，测量发送吞吐而不受往返时延限制，
+        此时响应时间统计为空；收到的消息由后台任务读取并丢弃，避免接收队列填满后
+        阻塞 ping/pong。
+        """
+        if concurrency < 1:
+            # 连接池为空或分波步长为 0，都无法执行测试
+            print("❌ 错误: 并发数必须大于 0 (当前: {})".format(concurrency))
+            return
         
-        # 创建信号量限制并发数
-        semaphore = asyncio.Semaphore(concurrency)
+        print("🚀 开始压力测试: {} 次{}，并发数: {}".format(
+            count, '测试（复用连接）' if reuse_connections else '连接', concurrency))
+        if batch > 1:
+            print("📦 每个连接批量发送 {} 条消息".format(batch))
+        if not wait_response:
+            print("📤 不等待响应，仅统计发送数")
         
-        async def limited_test():
-            async with semaphore:
-                return await single_test()
+        # 预先编码一次，所有发送共享同一个缓冲区，避免每次发送都重新编码
+        payload = message.encode('utf-8') if SEND_BYTES_AS_TEXT else message
         
-        # 执行并发测试
-        tasks = [limited_test() for _ in range(count)]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        def start_discarding(probes):
+            """不等待响应时为每个连接启动丢弃接收消息的后台任务"""
+            if wait_response:
+                return []
+            return [asyncio.ensure_future(probe.discard_incoming()) for probe in probes]
         
-        # 汇总统计
-        total_stats = {
-            'connection_attempts': 0,
-            'successful_connections': 0,
-            'failed_connections': 0,
-            'messages_sent': 0,
-            'messages_received': 0,
-            'total_response_time': 0,
-            'min_response_time': float('inf'),
-            'max_response_time': 0
-        }
+        async def stop_discarding(tasks):
+            # 连接关闭后丢弃任务会自行结束，这里只是确保提前退出时也被取消
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
         
-        for result in results:
-            if isinstance(result, dict):
-                for key in total_stats:
-                    if key in result:
-                        if key in ['total_response_time', 'min_response_time', 'max_response_time']:
-                            if result[key] != float('inf'):
-                                if key == 'min_response_time':
-                                    total_stats[key] = min(total_stats[key], result[key])
-                                elif key == 'max_response_time':
-                                    total_stats[key] = max(total_stats[key], result[key])
-                                else:
-                                    total_stats[key] += result[key]
-                        else:
-                            total_stats[key] += result[key]
+        async def exercise(probe):
+            await probe.ping_test()
+            if batch > 1:
+                await probe.send_many([payload] * batch, expect_response=wait_response)
+            else:
+                await probe.send_message(payload, expect_response=wait_response)
+        
+        if reuse_connections:
+            # 建立连接池，队列本身即限制了并发数
+            probes = [WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify)
+                      for _ in range(min(concurrency, count))]
+            connected = await asyncio.gather(*[probe.connect() for probe in probes])
+            pool = asyncio.Queue()
+            for probe, ok in zip(probes, connected):
+                if ok:
+                    pool.put_nowait(probe)
+            discard_tasks = start_discarding([probe for probe, ok in zip(probes, connected) if ok])
+            
+            async def pooled_test():
+                probe = await pool.get()
+                try:
+                    await exercise(probe)
+                finally:
+                    pool.put_nowait(probe)
+            
+            try:
+                if pool.empty():
+                    print("❌ 无可用连接，跳过压力测试")
+                else:
+                    await asyncio.gather(*[pooled_test() for _ in range(count)], return_exceptions=True)
+            finally:
+                # 先关闭连接再停止丢弃任务：关闭握手期间仍需读取积压的消息才能收到关闭帧
+                await asyncio.gather(*[probe.close() for probe in probes], return_exceptions=True)
+                await stop_discarding(discard_tasks)
+            results = [probe.stats for probe in probes]
+        else:
+            async def single_test():
+                probe = WebSocketProbe(uri, headers=headers, skip_ssl_verify=skip_ssl_verify)
+                if await probe.connect():
+                    discard_tasks = start_discarding([probe])
+                    try:
+                        await exercise(probe)
+                        await probe.close()
+                    finally:
+                        await stop_discarding(discard_tasks)
+                return probe.stats
+            
+            # 以 concurrency 个任务为一波分批执行，同一时间只存在一波任务对象，
+            # 而不是一次性创建 count 个任务再由信号量排队
+            results = []
+            for start in range(0, count, concurrency):
+                wave = [single_test() for _ in range(min(concurrency, count - start))]
+                results.extend(await asyncio.gather(*wave, return_exceptions=True))
+        
+        # 汇总统计
+        total_stats = ProbeStats.aggregate([result for result in results if isinstance(result, ProbeStats)])
         
         # 打印汇总统计
         print("=" * 50)
         print("📊 压力测试汇总统计")
         print("=" * 50)
-        print("总连接尝试次数: {}".format(total_stats['connection_attempts']))
-        print("总成功连接次数: {}".format(total_stats['successful_connections']))
-        print("总失败连接次数: {}".format(total_stats['failed_connections']))
-        print("总发送消息数量: {}".format(total_stats['messages_sent']))
-        print("总接收消息数量: {}".format(total_stats['messages_received']))
-        
-        if total_stats['messages_received'] > 0:
-            avg_response_time = total_stats['total_response_time'] / total_stats['messages_received']
-            print("平均响应时间: {:.2f}ms".format(avg_response_time))
-        
-        if total_stats['min_response_time'] != float('inf'):
-            print("最小响应时间: {:.2f}ms".format(total_stats['min_response_time']))
-            print("最大响应时间: {:.2f}ms".format(total_stats['max_response_time']))
-        
-        if total_stats['connection_attempts'] > 0:
-            success_rate = (total_stats['successful_connections'] / total_stats['connection_attempts']) * 100
-            print("总体连接成功率: {:.1f}%".format(success_rate))
+        print("总连接尝试次数: {}".format(total_stats.connection_attempts))
+        print("总成功连接次数: {}".format(total_stats.successful_connections))
+        print("总失败连接次数: {}".format(total_stats.failed_connections))
+        print("总发送消息数量: {}".format(total_stats.messages_sent))
+        print("总接收消息数量: {}".format(total_stats.messages_received))
+        
+        if total_stats.messages_received > 0:
+            print("平均响应时间: {:.2f}ms".format(total_stats.avg_response_time))
+        
+        if total_stats.min_response_time != float('inf'):
+            print("最小响应时间: {:.2f}ms".format(total_stats.min_response_time))
+            print("最大响应时间: {:.2f}ms".format(total_stats.max_response_time))
+        
+        if total_stats.connection_attempts > 0:
+            print("总体连接成功率: {:.1f}%".format(total_stats.success_rate))
         print("=" * 50)
 
     async def interactive_mode(self, uri: str, headers: Optional[Dict] = None, 
@@ -496,22 +789,18 @@ class WebSocketProbeRunner:
                     # 在 Python 3.6 中，我们需要使用其他方法
                     user_input = await self._get_user_input("📤 发送: ")
                     
-                    if user_input.lower() in ['quit', 'exit', 'q']:
-                        break
-                    elif user_input.lower() == 'ping':
-                        await probe.ping_test()
-                        continue
-                    elif user_input.lower() == 'stats':
-                        self._print_interactive_stats(probe)
-                        continue
-                    elif user_input.lower() == 'help':
-                        self._print_interactive_help()
-                        continue
-                    elif not user_input.strip():
+                    # 只有长度不超过最长命令名的输入才可能是命令，避免对长消息做 lower()
+                    if len(user_input) <= self._command_max_len:
+                        handler = self._commands.get(user_input.lower())
+                        if handler is not None:
+                            if not await handler(probe):
+                                break
+                            continue
+                    if not user_input.strip():
                         continue
                     
                     await probe.connection.send(user_input)
-                    probe.stats['messages_sent'] += 1
+                    probe.stats.messages_sent += 1
                     print("📤 已发送: {}".format(user_input))
                     
                 except Exception as e:
@@ -519,23 +808,51 @@ class WebSocketProbeRunner:
                     
         finally:
             receive_task.cancel()
+            # 不等待可能仍阻塞在 input() 上的线程
+            self._input_executor.shutdown(wait=False)
             await probe.close()
             probe.print_stats()
 
+    async def _cmd_ping(self, probe: 'WebSocketProbe') -> bool:
+        """交互命令: ping"""
+        await probe.ping_test()
+        return True
+
+    async def _cmd_stats(self, probe: 'WebSocketProbe') -> bool:
+        """交互命令: stats"""
+        self._print_interactive_stats(probe)
+        return True
+
+    async def _cmd_help(self, probe: 'WebSocketProbe') -> bool:
+        """交互命令: help"""
+        self._print_interactive_help()
+        return True
+
+    async def _cmd_quit(self, probe: 'WebSocketProbe') -> bool:
+        """交互命令: quit/exit/q"""
+        return False
+
     async def _get_user_input(self, prompt: str) -> str:
         """获取用户输入（Python 3.6 兼容）"""
         # 在 Python 3.6 中，我们需要使用事件循环来获取用户输入
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, lambda: input(prompt))
+        return await loop.run_in_executor(self._input_executor, input, prompt)
+
+    def _timestamp(self) -> str:
+        """返回当前时间的 HH:MM:SS 字符串，每秒最多格式化一次"""
+        now = int(time.time())
+        if now != self._last_sec:
+            self._last_ts = time.strftime("%H:%M:%S", time.localtime(now))
+            self._last_sec = now
+        return self._last_ts
 
     async def _message_receiver(self, probe: 'WebSocketProbe'):
         """消息接收器"""
         try:
             while True:
                 message = await probe.connection.recv()
-                probe.stats['messages_received'] += 1
-                timestamp = time.strftime("%H:%M:%S")
-                print("\n📥 [{}] 收到: {}".format(timestamp, message))
+                probe.stats.messages_received += 1
+                print("\n📥 [{}] 收到: {}".format(self._timestamp(), message))
                 print("📤 发送: ", end="", flush=True)
         except ConnectionClosedException:
             print("\n🔌 WebSocket 连接已关闭")
@@ -545,8 +862,8 @@ class WebSocketProbeRunner:
     def _print_interactive_stats(self, probe: 'WebSocketProbe'):
         """打印交互模式统计信息"""
         print("\n📊 实时统计:")
-        print("  发送消息数: {}".format(probe.stats['messages_sent']))
-        print("  接收消息数: {}".format(probe.stats['messages_received']))
+        print("  发送消息数: {}".format(probe.stats.messages_sent))
+        print("  接收消息数: {}".format(probe.stats.messages_received))
         try:
             connected = probe.connection and not probe.connection.closed
         except:
@@ -570,6 +887,42 @@ class WebSocketProbeRunner:
         print("  - 查看连接状态: stats")
         print()
 
+def install_fast_event_loop() -> bool:
+    """
+    安装 uvloop 事件循环策略（如果可用）
+    
+    uvloop 基于 libuv，在压力测试这类大量并发连接的场景下明显快于默认的 selector 事件循环。
+    uvloop 为可选依赖，未安装（或在 Windows 上）时保持默认事件循环。
+    
+    Returns:
+        bool: 是否已启用 uvloop
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+def has_websockets_speedups() -> bool:
+    """
+    检查 websockets 的 C 扩展（websockets.speedups）是否可用
+    
+    该扩展负责帧掩码等逐字节的计算，缺失时 websockets 会回退到纯 Python 实现。
+    官方 wheel 已包含该扩展，通常只有从源码安装且未编译成功时才会缺失。
+    """
+    try:
+        return importlib.util.find_spec('websockets.speedups') is not None
+    except (ImportError, ValueError):
+        return False
+
+def positive_int(value: str) -> int:
+    """argparse 类型：大于 0 的整数"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("必须为大于 0 的整数: {}".format(value))
+    return number
+
 def main():
     parser = argparse.ArgumentParser(description='WebSocket 探测工具')
     parser.add_argument('uri', help='WebSocket 服务器地址 (例如: ws://localhost:8080/ws)')
@@ -580,8 +933,16 @@ def main():
                        help='连续模式下的间隔时间秒数 (默认: 5)')
     parser.add_argument('--count', type=int, default=10, 
                        help='压力测试模式下的连接次数 (默认: 10)')
-    parser.add_argument('--concurrency', type=int, default=3, 
+    parser.add_argument('--concurrency', type=positive_int, default=3, 
                        help='压力测试模式下的并发数 (默认: 3)')
+    parser.add_argument('--batch', type=int, default=1,
+                       help='压力测试模式下每个连接批量发送的消息数 (默认: 1)')
+    parser.add_argument('--reuse-connections', dest='reuse_connections', action='store_true', default=True,
+                       help='压力测试模式下复用 concurrency 个长连接 (默认启用)')
+    parser.add_argument('--no-reuse-connections', dest='reuse_connections', action='store_false',
+                       help='压力测试模式下每次测试都新建连接，用于测量握手开销')
+    parser.add_argument('--no-wait-response', dest='wait_response', action='store_false', default=True,
+                       help='压力测试模式下只发送不等待响应，测量发送吞吐 (不记录响应时间；收到的消息在后台读取并丢弃)')
     parser.add_argument('--headers', help='JSON格式的HTTP头部 (例如: \'{"Authorization": "Bearer token"}\')')
     parser.add_argument('--timeout', type=int, default=5, help='超时时间秒数 (默认: 5)')
     parser.add_argument('--skip-ssl-verify', action='store_true', 
@@ -595,8 +956,8 @@ def main():
     headers = None
     if args.headers:
         try:
-            headers = json.loads(args.headers)
-        except json.JSONDecodeError:
+            headers = json_loads(args.headers)
+        except ValueError:  # json.JSONDecodeError 与 orjson.JSONDecodeError 均为 ValueError 子类
             print("❌ 错误: 无法解析headers JSON格式")
             return 1
     
@@ -624,6 +985,13 @@ def main():
         print("🔍 调试模式: 已启用")
     print("-" * 50)
     
+    # 压力/连续模式以 I/O 为主，优先使用 uvloop
+    if args.mode in ('stress', 'continuous') and install_fast_event_loop():
+        print("⚡ 已启用 uvloop 事件循环")
+    if args.mode in ('stress', 'continuous') and not has_websockets_speedups():
+        print("⚠️ 未检测到 websockets C 扩展，帧掩码将使用纯 Python 实现；"
+              "建议使用官方 wheel 重新安装: pip install --force-reinstall --only-binary websockets websockets")
+    
     try:
         # Python 3.6 兼容性：使用 get_event_loop().run_until_complete() 替代 asyncio.run()
         try:
@@ -638,7 +1006,7 @@ def main():
         elif args.mode == 'continuous':
             loop.run_until_complete(runner.continuous_probe(args.uri, args.interval, args.message, headers, args.skip_ssl_verify))
         elif args.mode == 'stress':
-            loop.run_until_complete(runner.stress_test(args.uri, args.count, args.concurrency, args.message, headers, args.skip_ssl_verify))
+            loop.run_until_complete(runner.stress_test(args.uri, args.count, args.concurrency, args.message, headers, args.skip_ssl_verify, args.batch, args.reuse_connections, args.wait_response))
         elif args.mode == 'interactive':
             loop.run_until_complete(runner.interactive_mode(args.uri, headers, args.skip_ssl_verify, args.debug))
     except KeyboardInterrupt:
@@ -647,6 +1015,10 @@ def main():
     except Exception as e:
         print("\n❌ 程序执行出错: {}".format(str(e)))
         return 1
+    finally:
+        # 退出前在同一个事件循环中关闭缓存的 HTTP 会话
+        if WebSocketProbe._SESSION_CACHE:
+            loop.run_until_complete(WebSocketProbe.close_sessions())
     
     return 0
 